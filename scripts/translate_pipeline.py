@@ -3,30 +3,58 @@
 Main translation pipeline: PDF → Parse → Translate → Polish → Verify → Supplements → LaTeX → PDF
 """
 
+import re
 import sys
-import json
 import argparse
+import hashlib
+import shutil
 import subprocess
+import threading
+from contextlib import ExitStack
 from pathlib import Path
 
 # Add src to sys.path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from pcm.core.pdf_parser import PDFParser
-from pcm.core.translator import OllamaTranslator
+from pcm.core.translator import TRANSLATION_ERROR_MARK, OllamaTranslator
 from pcm.core.supplement_generator import SupplementGenerator
 from pcm.core.verifier import TranslationVerifier
-from pcm.core.json_to_latex import generate_full_document
+from pcm.core.json_to_latex import generate_full_document, list_section_files
+from pcm.core import jsonio
+from pcm.core.cache import DiskCache, hash_file
+from pcm.core.concurrency import DEFAULT_PARALLEL, BackgroundWriter, ClientPool, staged_map
 from tqdm import tqdm
 
 TOTAL_STEPS = 8
 
+# Back-matter titles that get no supplements
+REFS_RE = re.compile(r"references|bibliography|acknowledg", re.I)
+
+
+def sections_fingerprint(sections_dir: Path, part_label: str) -> str:
+    """Hash of every section file (and enrichment sidecar) plus the part
+    label, i.e. of everything Step 7 turns into LaTeX."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(part_label.encode("utf-8"))
+    files = list_section_files(sections_dir) + list_section_files(sections_dir / "enrichments")
+    for path in files:
+        h.update(b"\x00" + str(path.relative_to(sections_dir)).encode("utf-8") + b"\x00")
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
 
 def main():
     parser = argparse.ArgumentParser(description="Translate PDF to Korean LaTeX/PDF")
     parser.add_argument("--input", default="PCM.pdf", help="Input PDF file")
     parser.add_argument("--output", default="output", help="Output directory")
     parser.add_argument("--model", default="gemma2:9b", help="Ollama model for translation")
+    parser.add_argument("--model-quant", choices=["q4_K_M", "q5_K_M", "q8_0"], default=None,
+                        help="Use this quantization of --model by appending it to the tag "
+                             "(e.g. --model gemma2:9b-instruct --model-quant q4_K_M -> "
+                             "gemma2:9b-instruct-q4_K_M). Decoding is memory-bound, so "
+                             "smaller weights raise tokens/s and leave VRAM for more "
+                             "OLLAMA_NUM_PARALLEL slots")
     parser.add_argument("--supplement-model", default="qwen2.5-coder:7b",
                         help="Ollama model for supplement generation")
     parser.add_argument("--start-page", type=int, default=0, help="Start page (0-indexed)")
@@ -45,9 +73,39 @@ def main():
     parser.add_argument("--skip-latex", action="store_true", help="Skip LaTeX generation")
     parser.add_argument("--skip-pdf", action="store_true", help="Skip PDF build")
     parser.add_argument("--part", default="I", help="Part label for LaTeX (I, II, etc.)")
+    parser.add_argument("--concurrency", "--num-parallel", type=int, default=DEFAULT_PARALLEL,
+                        help="Max in-flight translation requests per endpoint (chunks, "
+                             "polish passes and titles together), and sections in flight "
+                             "in the other stages (default: $OLLAMA_NUM_PARALLEL or 4). "
+                             "Start the server with OLLAMA_NUM_PARALLEL=<N> ollama serve "
+                             "so it actually runs N requests at once instead of queueing them")
+    parser.add_argument("--verify-parallel", type=int, default=None,
+                        help="Concurrent sections in verification (default: --concurrency)")
+    parser.add_argument("--supp-parallel", type=int, default=None,
+                        help="Concurrent sections in supplement generation (default: "
+                             "--concurrency); the supplement model often runs on its own GPU")
+    parser.add_argument("--supp-min-words", type=int, default=40,
+                        help="Skip supplements for sections with fewer source words")
+    parser.add_argument("--force-reparse", action="store_true",
+                        help="Parse the PDF even if a cached parse exists")
+    parser.add_argument("--force-rebuild", action="store_true",
+                        help="Regenerate LaTeX and PDF even if no section changed "
+                             "since the last successful build")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and don't update the translation and LLM response "
+                             "caches (<output>/.tm_cache.sqlite, <output>/.llm_cache.sqlite)")
+    parser.add_argument("--ollama-endpoints", default="http://localhost:11434",
+                        help="Comma-separated Ollama base URLs; translation is spread "
+                             "across them, --concurrency requests each. On a multi-GPU "
+                             "host run one server per GPU, e.g. "
+                             "CUDA_VISIBLE_DEVICES=0 OLLAMA_HOST=127.0.0.1:11434 ollama serve, "
+                             "CUDA_VISIBLE_DEVICES=1 OLLAMA_HOST=127.0.0.1:11435 ollama serve")
 
     args = parser.parse_args()
 
+    if args.model_quant and not args.model.endswith(args.model_quant):
+        args.model = f"{args.model}-{args.model_quant}"
+
     if args.test:
         args.end_page = (args.start_page or 0) + 3
         print("=" * 60)
@@ -57,184 +115,350 @@ def main():
     # ─── Step 1: Initialize models ───
     print(f"\n[1/{TOTAL_STEPS}] Initializing models...")
 
-    translator = None
+    endpoints = [u.strip().rstrip("/") for u in args.ollama_endpoints.split(",") if u.strip()]
+
+    translators = []
     if not args.skip_translation:
-        translator = OllamaTranslator(model_name=args.model)
-        if not translator.test_connection():
+        for url in endpoints:
+            # Chunk, polish and title requests of all sections on this
+            # endpoint share --concurrency slots (and connections)
+            candidate = OllamaTranslator(model_name=args.model, base_url=url,
+                                         pool_size=args.concurrency)
+            if candidate.test_connection():
+                translators.append(candidate)
+            else:
+                print(f"  Skipping unreachable endpoint: {url}")
+                candidate.close()
+        if not translators:
             print("\nCannot connect to Ollama.")
             print("Please ensure Ollama is running: ollama serve")
             print(f"And model is installed: ollama pull {args.model}")
             return
+    # Each endpoint is lent to up to --concurrency sections at once; their
+    # requests share the translator's --concurrency slots, so the endpoint
+    # never has more than --concurrency translation requests in flight
+    translator = ClientPool(translators, per_client=args.concurrency) if translators else None
 
     verifier = None
     if not args.skip_verify:
         verify_types = [t.strip() for t in args.verify_types.split(",")]
         verifier = TranslationVerifier(
             model_name=args.verify_model,
+            base_url=endpoints[0],
             verify_types=verify_types,
             research_model=args.research_model,
+            # Verification modules 2-4 run concurrently within each section
+            pool_size=(args.verify_parallel or args.concurrency) * 3,
+            # LLM responses are reused across runs unless --no-cache
+            cache_path=None if args.no_cache else str(Path(args.output) / ".llm_cache.sqlite"),
         )
         if not verifier.test_connection():
             print(f"\nVerify model not available: {args.verify_model}")
             print("Continuing without verification...")
+            verifier.close()
             verifier = None
 
     supp_generator = None
     if not args.skip_supplements:
-        supp_generator = SupplementGenerator(model_name=args.supplement_model)
+        supp_generator = SupplementGenerator(model_name=args.supplement_model,
+                                             base_url=endpoints[0],
+                                             pool_size=args.supp_parallel or args.concurrency)
         if not supp_generator.test_connection():
             print(f"\nSupplement model not available: {args.supplement_model}")
             print("Continuing without supplements...")
+            supp_generator.close()
             supp_generator = None
 
+    # Load every model in the background; not waited on, so model loading
+    # overlaps with PDF parsing instead of delaying the first requests
+    for client in (*translators, verifier, supp_generator):
+        if client:
+            threading.Thread(target=client.warmup, daemon=True).start()
+
     if not translator and not supp_generator and not verifier:
         print("  Parse-only mode\n")
     print()
 
+    try:
+        run_pipeline(args, translator, verifier, supp_generator)
+    finally:
+        for client in (*translators, verifier, supp_generator):
+            if client:
+                client.close()
+
+
+def run_pipeline(args, translator, verifier, supp_generator):
+    """Steps 2-8: parse, translate/verify/supplement, save, LaTeX, PDF."""
     # ─── Step 2: Parse PDF ───
     print(f"[2/{TOTAL_STEPS}] Parsing PDF: {args.input}")
     print(f"  Pages: {args.start_page} to {args.end_page or 'end'}")
     print(f"  Output: {args.output}/\n")
 
-    with PDFParser(args.input, args.output) as pdf_parser:
-        sections = pdf_parser.parse_full_document(args.start_page, args.end_page)
-
-        if not sections:
-            print("\nNo sections detected, falling back to page-by-page mode...")
-            end = args.end_page or len(pdf_parser.doc)
-            for page_num in range(args.start_page, min(end, len(pdf_parser.doc))):
-                text = pdf_parser.extract_text_from_page(page_num)
-                images = pdf_parser.extract_images_from_page(page_num)
-
-                page_data = {
-                    "section_id": f"page_{page_num + 1}",
-                    "title_original": f"Page {page_num + 1}",
-                    "title_translated": f"페이지 {page_num + 1}",
-                    "content_original": text,
-                    "content_translated": "",
-                    "images": images,
-                    "page_range": [page_num + 1, page_num + 1],
-                    "level": "subsection",
-                    "font_size": 8.1,
-                    "supplements": {},
-                }
-                sections[f"page_{page_num + 1}"] = page_data
-
-        print(f"\nFound {len(sections)} sections\n")
-
-        # ─── Step 3: Translate ───
+    pdf_hash = hash_file(args.input)
+    # Parse results are cached per PDF content and page range
+    parse_cache = (Path(args.output) / ".parse_cache"
+                   / f"{pdf_hash}_{args.start_page}_{args.end_page}.json")
+
+    # Section files left by an earlier run are only resumed from if that run
+    # was on the same PDF (older outputs without a recorded hash are trusted)
+    metadata_path = Path(args.output) / "metadata.json"
+    resume = True
+    if metadata_path.exists():
+        try:
+            previous_hash = jsonio.load_file(metadata_path).get("pdf_hash")
+        except Exception:
+            previous_hash = None
+        if previous_hash and previous_hash != pdf_hash:
+            print("  Existing sections are from a different PDF, not resuming from them")
+            resume = False
+
+    with PDFParser(args.input, args.output) as pdf_parser, ExitStack() as exit_stack:
+        sections = {}
+        # Record the PDF before any section file is (re)written
+        pdf_parser.save_metadata(sections, pdf_hash)
+
+        def load_parse_cache():
+            """Cached (section_id, section_data) pairs, or None on a miss."""
+            if args.force_reparse or not parse_cache.exists():
+                return None
+            try:
+                cached = jsonio.load_file(parse_cache)
+            except Exception as e:
+                print(f"  Warning: Could not read parse cache: {e}")
+                return None
+            # Extracted images live outside the cache; reparse if any are gone
+            for _, section_data in cached:
+                if not all(Path(img["path"]).exists() for img in section_data.get("images", [])):
+                    return None
+            print(f"  Using cached parse: {parse_cache.name}")
+            return cached
+
+        def parse():
+            """Yield (section_id, section_data) from the parse cache or the PDF."""
+            cached = load_parse_cache()
+            if cached is not None:
+                yield from cached
+                return
+
+            # Shallow copies: later stages add keys to the yielded dicts
+            parsed = []
+            for section_id, section_data in pdf_parser.iter_sections(args.start_page,
+                                                                     args.end_page):
+                parsed.append((section_id, dict(section_data)))
+                yield section_id, section_data
+
+            if not parsed:
+                print("\nNo sections detected, falling back to page-by-page mode...")
+                for page_num, text, images in pdf_parser.iter_pages(args.start_page,
+                                                                    args.end_page):
+                    page_data = {
+                        "section_id": f"page_{page_num + 1}",
+                        "title_original": f"Page {page_num + 1}",
+                        "title_translated": f"페이지 {page_num + 1}",
+                        "content_original": text,
+                        "content_translated": "",
+                        "images": images,
+                        "page_range": [page_num + 1, page_num + 1],
+                        "level": "subsection",
+                        "font_size": 8.1,
+                        "supplements": {},
+                    }
+                    parsed.append((page_data["section_id"], dict(page_data)))
+                    yield page_data["section_id"], page_data
+
+            parse_cache.parent.mkdir(parents=True, exist_ok=True)
+            jsonio.dump_file(parsed, parse_cache)
+
+        def parsed_sections():
+            """Register and yield section ids as the parser completes them,
+            so translation starts while later pages are still being parsed."""
+            for section_id, section_data in parse():
+                if section_id in sections:
+                    print(f"  Warning: duplicate section {section_id}, keeping the first")
+                    continue
+                sections[section_id] = section_data
+                yield section_id
+
+        # ─── Steps 3-5: Translate → Verify → Supplements ───
+        # Stages are pipelined: a section moves on to verification as soon as
+        # its translation returns, and to supplements once it is verified.
+        stages = []
+
         if translator and not args.skip_translation:
-            print(f"[3/{TOTAL_STEPS}] Translating {len(sections)} sections...")
+            print(f"[3/{TOTAL_STEPS}] Translating sections as they are parsed...")
             print(f"  Model: {args.model}")
+            print(f"  Endpoints: {', '.join(t.base_url for t in translator.clients)}")
             print(f"  Polish: {'OFF' if args.skip_polish else 'ON (2-pass)'}\n")
 
-            for section_id, section_data in tqdm(sections.items(),
-                                                  desc="Translating", unit="section"):
-                
+            # Translation memory: sections whose source text, model and prompts
+            # are unchanged since any earlier run are taken from the cache
+            tm_cache = None
+            if not args.no_cache:
+                tm_cache = DiskCache(Path(args.output) / ".tm_cache.sqlite", table="translations")
+                exit_stack.callback(tm_cache.close)
+            cached_fields = ("title_translated", "content_translated")
+
+            def translate(section_id):
                 # Resume logic: Check if JSON already exists with translation
                 safe_filename = section_id.replace(".", "_") + ".json"
                 json_path = Path(args.output) / "sections" / safe_filename
                 
-                if json_path.exists():
+                if resume and json_path.exists():
                     try:
-                        with open(json_path, "r", encoding="utf-8") as f:
-                            existing_data = json.load(f)
-                            if existing_data.get("content_translated"):
-                                print(f"  Section {section_id} already translated, skipping...")
-                                sections[section_id] = existing_data
-                                continue
+                        existing_data = jsonio.load_section(json_path)
+                        if (existing_data.get("content_translated")
+                                and not existing_data.get("translation_failed")):
+                            print(f"  Section {section_id} already translated, skipping...")
+                            return existing_data
                     except Exception as e:
                         print(f"  Warning: Could not read existing JSON for {section_id}: {e}")
 
-                sections[section_id] = translator.translate_section(
-                    section_data,
-                    do_polish=not args.skip_polish
-                )
-                
-                # Incremental save
-                pdf_parser.save_sections_to_json({section_id: sections[section_id]})
+                section_data = sections[section_id]
+                key = translator.clients[0].cache_key(section_data, not args.skip_polish)
+                if tm_cache:
+                    hit = tm_cache.get(key)
+                    # Entries holding an error (stored by older runs) are
+                    # translated again
+                    if hit is not None and TRANSLATION_ERROR_MARK.encode() not in hit:
+                        section_data.update(jsonio.loads(hit))
+                        section_data["translation_failed"] = False
+                        return section_data
+                with translator.acquire() as client:
+                    result = client.translate_section(
+                        section_data,
+                        do_polish=not args.skip_polish
+                    )
+                # Failed requests are retried on the next run, not replayed
+                if tm_cache and not result.get("translation_failed"):
+                    tm_cache.put(key, jsonio.dumps(
+                        {k: result[k] for k in cached_fields if k in result}))
+                return result
+
+            stages.append(("translate", translate, translator.capacity))
         else:
             print(f"[3/{TOTAL_STEPS}] Skipping translation\n")
 
-        # ─── Step 4: Verify translations ───
+        verify_scores = []
+        low_score_sections = []
         if verifier and not args.skip_verify:
-            print(f"[4/{TOTAL_STEPS}] Verifying {len(sections)} sections...")
+            print(f"[4/{TOTAL_STEPS}] Verifying sections as they are translated...")
             print(f"  Model: {args.verify_model}")
-            print(f"  Types: {', '.join(verifier.verify_types)}\n")
-
-            verify_scores = []
-            low_score_sections = []
-
-            for section_id, section_data in tqdm(sections.items(),
-                                                  desc="Verifying", unit="section"):
-                if not section_data.get("content_translated"):
-                    continue
-                print(f"\n  Section {section_id}:")
-                report = verifier.verify_section(section_data)
-                sections[section_id]["verification"] = report
-                score = report.get("score", 0)
-                verify_scores.append(score)
-                if score < 60:
-                    low_score_sections.append((section_id, score))
-                print(f"    → Score: {score} "
-                      f"(F:{report.get('formula', {}).get('score', '-')} "
-                      f"S:{report.get('semantic', {}).get('score', '-')} "
-                      f"L:{report.get('logic', {}).get('score', '-')} "
-                      f"R:{report.get('research', {}).get('score', '-')})")
-                
-                # Incremental save after verification
-                pdf_parser.save_sections_to_json({section_id: sections[section_id]})
-
-            if verify_scores:
-                avg = sum(verify_scores) / len(verify_scores)
-                print(f"\n  Average verification score: {avg:.1f}")
-                if low_score_sections:
-                    print(f"  Low-score sections (<60):")
-                    for sid, sc in low_score_sections:
-                        print(f"    {sid}: {sc}")
-
-            # Enrichment: generate educational content via deep research
-            print(f"\n  Enriching sections with educational content...")
-            for section_id, section_data in tqdm(sections.items(),
-                                                  desc="Enriching", unit="section"):
-                if not section_data.get("content_original"):
-                    continue
-                print(f"\n  Enriching section {section_id}:")
-                enrichments = verifier.enrich_section(section_data)
-                if enrichments:
-                    sections[section_id]["enrichments"] = enrichments
-                    print(f"    → {len(enrichments)} concepts researched")
-                else:
-                    print(f"    → No enrichment needed")
-
-            print()
+            print(f"  Types: {', '.join(verifier.verify_types)}")
+            print(f"  Enriching sections with educational content\n")
+
+            def verify(section_id):
+                section_data = sections[section_id]
+                report = None
+                if section_data.get("content_translated"):
+                    report = verifier.verify_section(section_data)
+                enrichments = None
+                # Enrichment: generate educational content via deep research
+                if section_data.get("content_original"):
+                    enrichments = verifier.enrich_section(section_data)
+                return report, enrichments
+
+            stages.append(("verify", verify, args.verify_parallel or args.concurrency))
         else:
             print(f"[4/{TOTAL_STEPS}] Skipping verification\n")
 
-        # ─── Step 5: Generate supplements ───
         if supp_generator and not args.skip_supplements:
-            print(f"[5/{TOTAL_STEPS}] Generating supplements for {len(sections)} sections...")
+            print(f"[5/{TOTAL_STEPS}] Generating supplements as sections are verified...")
             print(f"  Model: {args.supplement_model}\n")
 
-            for section_id, section_data in tqdm(sections.items(),
-                                                  desc="Supplements", unit="section"):
-                print(f"\n  Section {section_id}:")
-                supplements = supp_generator.generate_all_supplements(section_data)
-                sections[section_id]["supplements"] = supplements
-                print(f"    → Generated: {', '.join(supplements.keys()) if supplements else 'none'}")
-                
-                # Incremental save after supplements
-                pdf_parser.save_sections_to_json({section_id: sections[section_id]})
+            def supplement(section_id):
+                section_data = sections[section_id]
+                # Page headers, near-empty pages and reference lists gain
+                # nothing from supplements; don't spend LLM calls on them
+                if (len(section_data.get("content_original", "").split()) < args.supp_min_words
+                        or REFS_RE.search(section_data.get("title_original", ""))):
+                    return {}
+                return supp_generator.generate_all_supplements(section_data)
+
+            stages.append(("supplements", supplement, args.supp_parallel or args.concurrency))
         else:
             print(f"[5/{TOTAL_STEPS}] Skipping supplement generation\n")
 
+        # Each section's file is rewritten on a background thread after every
+        # stage, so a crash loses at most the stages still in flight
+        done_per_stage = {name: 0 for name, _, _ in stages}
+        with BackgroundWriter(pdf_parser.save_single_section) as writer:
+            if stages:
+                # Parsing feeds the first stage lazily
+                progress = tqdm(staged_map(parsed_sections(), stages),
+                                desc="Processing", unit="step")
+            else:
+                # Parse-only: nothing runs per section, just drain the parser
+                progress = ()
+                for section_id in parsed_sections():
+                    writer.submit(section_id, dict(sections[section_id]))
+            for stage, section_id, result in progress:
+                # Stages overlap, so show how far each one has got
+                done_per_stage[stage] += 1
+                progress.set_postfix(done_per_stage, refresh=False)
+                if stage == "translate":
+                    sections[section_id] = result
+
+                elif stage == "verify":
+                    report, enrichments = result
+                    if report is not None:
+                        print(f"\n  Section {section_id}:")
+                        sections[section_id]["verification"] = report
+                        score = report.get("score", 0)
+                        verify_scores.append(score)
+                        if score < 60:
+                            low_score_sections.append((section_id, score))
+                        print(f"    → Score: {score} "
+                              f"(F:{report.get('formula', {}).get('score', '-')} "
+                              f"S:{report.get('semantic', {}).get('score', '-')} "
+                              f"L:{report.get('logic', {}).get('score', '-')} "
+                              f"R:{report.get('research', {}).get('score', '-')})")
+                    if enrichments:
+                        sections[section_id]["enrichments"] = enrichments
+                        print(f"    → {len(enrichments)} concepts researched")
+
+                else:
+                    print(f"\n  Section {section_id}:")
+                    sections[section_id]["supplements"] = result
+                    print(f"    → Generated: {', '.join(result.keys()) if result else 'none'}")
+
+                # Incremental save after each stage; the shallow copy pins the
+                # top-level fields while later stages keep updating the section
+                writer.submit(section_id, dict(sections[section_id]))
+
+        print(f"\nFound {len(sections)} sections")
+
+        if verify_scores:
+            avg = sum(verify_scores) / len(verify_scores)
+            print(f"\n  Average verification score: {avg:.1f}")
+            if low_score_sections:
+                print(f"  Low-score sections (<60):")
+                for sid, sc in low_score_sections:
+                    print(f"    {sid}: {sc}")
+        if stages:
+            print()
+
         # ─── Step 6: Save JSON results ───
+        # Section files were written as each section finished; only the
+        # metadata is left
         print(f"[6/{TOTAL_STEPS}] Saving results...")
-        pdf_parser.save_sections_to_json(sections)
-        pdf_parser.save_metadata(sections)
+        pdf_parser.save_metadata(sections, pdf_hash)
+        print(f"  {len(sections)} sections in {pdf_parser.sections_dir}")
+
+    # Skip Steps 7-8 when the sections are byte-identical to the last build
+    final_pdf = Path(args.output) / "translated.pdf"
+    stamp_file = Path(args.output) / ".build_stamp"
+    stamp = None
+    up_to_date = False
+    if not args.skip_latex and not args.skip_pdf:
+        stamp = sections_fingerprint(Path(args.output) / "sections", args.part)
+        up_to_date = (not args.force_rebuild and final_pdf.exists()
+                      and stamp_file.exists() and stamp_file.read_text().strip() == stamp)
+        if up_to_date:
+            print(f"\nSections unchanged since the last build, {final_pdf} is up-to-date "
+                  f"(use --force-rebuild to rebuild)")
 
     # ─── Step 7: Generate LaTeX ───
-    if not args.skip_latex:
+    if not args.skip_latex and not up_to_date:
         print(f"\n[7/{TOTAL_STEPS}] Generating LaTeX...")
         latex_output = Path(args.output) / "latex" / "main.tex"
         generate_full_document(
@@ -246,29 +470,78 @@ def main():
         print(f"\n[7/{TOTAL_STEPS}] Skipping LaTeX generation")
 
     # ─── Step 8: Build PDF ───
-    if not args.skip_pdf and not args.skip_latex:
+    if not args.skip_pdf and not args.skip_latex and not up_to_date:
         print(f"\n[8/{TOTAL_STEPS}] Building PDF with XeLaTeX...")
         latex_dir = Path(args.output) / "latex"
         tex_file = latex_dir / "main.tex"
 
         if tex_file.exists():
-            for run in range(2):
-                label = "1st pass" if run == 0 else "2nd pass (TOC)"
-                print(f"  XeLaTeX {label}...")
-                result = subprocess.run(
-                    ["xelatex", "-interaction=nonstopmode", "main.tex"],
-                    cwd=str(latex_dir),
-                    capture_output=True, text=True, timeout=120
-                )
-                if result.returncode != 0:
-                    print(f"  XeLaTeX warning/error (may still produce PDF)")
-
+            if shutil.which("latexmk"):
+                # latexmk reruns XeLaTeX only as often as the .aux/.toc need and
+                # converts the .xdv to PDF once, after the last pass
+                passes = [("latexmk",
+                           ["latexmk", "-xelatex", "-f", "-interaction=nonstopmode",
+                            "-file-line-error", "main.tex"], 300)]
+            else:
+                # The 1st pass only has to write .aux/.toc; -no-pdf stops at the
+                # .xdv and skips the xdvipdfmx stage (font subsetting, images)
+                passes = [
+                    ("XeLaTeX 1st pass",
+                     ["xelatex", "-interaction=nonstopmode", "-file-line-error",
+                      "-no-pdf", "main.tex"], 120),
+                    ("XeLaTeX 2nd pass (TOC)",
+                     ["xelatex", "-interaction=nonstopmode", "-file-line-error",
+                      "main.tex"], 120),
+                ]
+            # A main.pdf left by an earlier build must not pass for this one's
             pdf_file = latex_dir / "main.pdf"
             if pdf_file.exists():
-                final_pdf = Path(args.output) / "translated.pdf"
-                import shutil
+                pdf_file.unlink()
+            returncode = None
+            for run, (label, cmd, timeout) in enumerate(passes):
+                print(f"  {label}...")
+                # Console output goes straight to a per-run file instead of
+                # through Python; it is only read back if the run fails
+                run_log = latex_dir / f"{cmd[0]}.{run}.log"
+                with open(run_log, "wb") as lf:
+                    try:
+                        returncode = subprocess.run(
+                            cmd,
+                            cwd=str(latex_dir),
+                            stdout=lf, stderr=subprocess.STDOUT, timeout=timeout
+                        ).returncode
+                    except subprocess.TimeoutExpired:
+                        returncode = None
+                if returncode is None:
+                    print(f"  {label} timed out after {timeout}s")
+                    print(f"    Full output: {run_log}")
+                    break
+                if returncode != 0:
+                    print(f"  XeLaTeX warning/error (may still produce PDF)")
+                    log_file = latex_dir / "main.log"
+                    if log_file.exists():
+                        log = log_file.read_text(encoding="utf-8", errors="replace")
+                        # -file-line-error marks errors as ./main.tex:<line>: ...
+                        errors = [l for l in log.splitlines() if l.startswith("./")]
+                        for line in errors[:5]:
+                            print(f"    {line}")
+                    with open(run_log, "rb") as lf:
+                        lf.seek(max(0, run_log.stat().st_size - 4096))
+                        tail = lf.read().decode(errors="replace")
+                    for line in tail.splitlines()[-5:]:
+                        print(f"    {line}")
+                    print(f"    Full output: {run_log}")
+
+            # A run killed by the timeout may leave a partly written PDF
+            if pdf_file.exists() and returncode is not None:
                 shutil.copy2(pdf_file, final_pdf)
                 print(f"\n  PDF generated: {final_pdf}")
+                # Only a clean last pass marks the build up to date; after
+                # errors the next run builds again
+                if returncode == 0:
+                    stamp_file.write_text(stamp)
+                else:
+                    print("  LaTeX reported errors; the PDF will be rebuilt on the next run")
             else:
                 print("  PDF generation failed. Check LaTeX logs.")
         else:
@@ -287,6 +560,5 @@ def main():
     if not args.skip_pdf:
         print(f"  PDF:           {args.output}/translated.pdf")
 
-
 if __name__ == "__main__":
     main()
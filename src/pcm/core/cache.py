@@ -0,0 +1,70 @@
+"""
+Persistent SQLite key/value cache for LLM results.
+Lets reruns skip work whose inputs (text, model, prompt version) are
+unchanged since the last run.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+
+def hash_key(*parts: str) -> str:
+    """Content hash of parts; separators keep ("ab", "c") != ("a", "bc")."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def hash_file(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in chunks so large PDFs aren't loaded whole."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DiskCache:
+    """Key/value table in a SQLite file, safe to share between threads."""
+
+    def __init__(self, path: Union[str, Path], table: str = "cache"):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value BLOB, ts REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[bytes]:
+        """Value stored under key, or None. With max_age (seconds), entries
+        stored longer ago than that count as missing."""
+        min_ts = time.time() - max_age if max_age is not None else 0
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value FROM {self._table} WHERE key = ? AND ts >= ?", (key, min_ts)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: bytes):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, ts) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,190 @@
+"""
+Bounded concurrency helpers for Ollama-bound work.
+Keeps a fixed number of requests in flight so large books neither spawn
+one thread per section nor overflow the Ollama request queue, and moves
+incremental saves off the request loop.
+"""
+
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Generic, Iterable, Iterator, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Requests kept in flight; match the server's OLLAMA_NUM_PARALLEL so
+# concurrent requests are served in parallel instead of queueing
+DEFAULT_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+_SENTINEL = object()
+
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T],
+                k: int = DEFAULT_PARALLEL) -> Iterator[Tuple[T, R]]:
+    """Apply fn to each item with at most k calls running at once.
+    Yields (item, result) in completion order; a new item is submitted as
+    soon as one finishes, so the window stays full until items run out.
+    Items are pulled lazily, so a generator input is never fully buffered.
+    """
+    k = max(1, k)
+    it = iter(items)
+    with ThreadPoolExecutor(max_workers=k) as ex:
+        pending = {}
+        for item in it:
+            pending[ex.submit(fn, item)] = item
+            if len(pending) >= k:
+                break
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                item = pending.pop(fut)
+                yield item, fut.result()
+                nxt = next(it, _SENTINEL)
+                if nxt is not _SENTINEL:
+                    pending[ex.submit(fn, nxt)] = nxt
+
+
+def staged_map(items: Iterable[T],
+               stages: Sequence[Tuple[str, Callable[[T], object], int]]
+               ) -> Iterator[Tuple[str, T, object]]:
+    """Push items through a chain of stages without a barrier between them.
+    stages is a sequence of (name, fn, k); each stage gets its own pool of
+    k workers, and an item enters stage i+1 as soon as stage i returns for
+    it. Yields (stage_name, item, result) as each stage finishes. The next
+    stage is submitted only after the caller resumes the generator, so it
+    sees whatever the caller stored from the previous result.
+    """
+    if not stages:
+        return
+    it = iter(items)
+    executors = [ThreadPoolExecutor(max_workers=max(1, k)) for _, _, k in stages]
+    pending = {}
+    first_window = max(1, stages[0][2])
+    in_first = 0
+
+    def submit(stage, item):
+        pending[executors[stage].submit(stages[stage][1], item)] = (stage, item)
+
+    def fill():
+        # Only the first stage pulls from items; later stages are fed by it
+        nonlocal in_first
+        while in_first < first_window:
+            item = next(it, _SENTINEL)
+            if item is _SENTINEL:
+                return
+            submit(0, item)
+            in_first += 1
+
+    try:
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage, item = pending.pop(fut)
+                yield stages[stage][0], item, fut.result()
+                if stage == 0:
+                    in_first -= 1
+                    fill()
+                if stage + 1 < len(stages):
+                    submit(stage + 1, item)
+    finally:
+        for ex in executors:
+            ex.shutdown(wait=True)
+
+
+class BackgroundWriter:
+    """Run save calls on one background thread, in submission order.
+    Incremental checkpoints then overlap with LLM calls instead of blocking
+    the loop that collects results. Use as a context manager; leaving the
+    block drains the queue.
+    """
+
+    def __init__(self, save_fn: Callable[..., None]):
+        self._save_fn = save_fn
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, *args):
+        """Queue save_fn(*args). Pass snapshots of data that may still change."""
+        self._queue.put(args)
+
+    def flush(self):
+        """Block until every submitted save has been written."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            args = self._queue.get()
+            try:
+                if args is None:
+                    return
+                self._save_fn(*args)
+            except Exception as e:
+                print(f"  Warning: background save failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RateLimiter:
+    """Token bucket shared between threads: on average at most rate calls
+    to acquire() per second, with bursts of up to burst calls.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ClientPool(Generic[T]):
+    """Lends out clients (e.g. one per Ollama endpoint) to worker threads.
+    Each client is held by at most per_client callers at once, so load is
+    spread across backends and no endpoint gets more than its share.
+    """
+
+    def __init__(self, clients: Sequence[T], per_client: int = 1):
+        self.clients = list(clients)
+        # Total concurrent callers the pool can serve without blocking
+        self.capacity = len(self.clients) * max(1, per_client)
+        self._free = queue.Queue()
+        for _ in range(max(1, per_client)):
+            for client in self.clients:
+                self._free.put(client)
+
+    @contextmanager
+    def acquire(self) -> Iterator[T]:
+        client = self._free.get()
+        try:
+            yield client
+        finally:
+            self._free.put(client)
@@ -4,10 +4,17 @@ Convert translated JSON sections to LaTeX files for XeLaTeX compilation.
 Handles markdown artifacts, math notation, and supplement materials.
 """
 
-import json
+import os
 import re
+from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from pcm.core import jsonio
+
+# Splits section ids like "1.2_3" into their numeric/text parts for sorting
+_SORT_RE = re.compile(r'[._]')
 
 
 def clean_for_latex(text: str) -> str:
@@ -175,41 +182,21 @@ def _escape_outside_math(text: str) -> str:
     return ''.join(result)
 
 
-def _safe_escape(text: str) -> str:
-    """Escape LaTeX specials while preserving existing LaTeX commands."""
-    # Temporarily protect existing LaTeX commands
-    protected = {}
-    counter = [0]
-
-    def protect(match):
-        key = f"@@PROT{counter[0]}@@"
-        protected[key] = match.group(0)
-        counter[0] += 1
-        return key
-
-    # Protect \textbf{}, \textit{}, \textsuperscript{}, etc.
-    text = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', protect, text)
-    # Protect \\ (line breaks)
-    text = re.sub(r'\\\\', protect, text)
-    # Protect \item
-    text = re.sub(r'\\item\b', protect, text)
-    # Protect \paragraph{...}
-    text = re.sub(r'\\paragraph\{[^}]*\}', protect, text)
-
-    # Now escape
-    text = text.replace('&', '\\&')
-    text = text.replace('%', '\\%')
-    text = text.replace('#', '\\#')
-    # Escape ALL remaining bare _ and ^ outside math mode
-    # (_wrap_bare_math already converted valid math patterns like a_1 → $a_1$)
-    text = text.replace('_', '\\_')
-    text = text.replace('^', '\\^{}')
-
-    # Restore protected
-    for key, val in protected.items():
-        text = text.replace(key, val)
+# Replacements for LaTeX specials outside math mode. Bare _ and ^ are
+# escaped too: _wrap_bare_math already converted valid math like a_1 → $a_1$
+_ESCAPES = {'&': '\\&', '%': '\\%', '#': '\\#', '_': '\\_', '^': '\\^{}'}
+# Existing LaTeX (\textbf{...}, \paragraph{...}, \\ line breaks, \item) is
+# matched first and kept as-is; any other match is a special char to escape.
+# A \\ whose second backslash starts a command leaves that command intact.
+_ESCAPE_RE = re.compile(
+    r'\\[a-zA-Z]+\{[^}]*\}|\\\\(?![a-zA-Z]+\{[^}]*\})|\\item\b|[&%#_^]'
+)
 
-    return text
+
+def _safe_escape(text: str) -> str:
+    """Escape LaTeX specials while preserving existing LaTeX commands,
+    in a single pass over the text."""
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(0), m.group(0)), text)
 
 
 def generate_preamble() -> str:
@@ -567,10 +554,68 @@ def generate_section_latex(section_data: Dict) -> str:
 """
 
 
-def generate_full_document(sections_dir: str, output_tex: str, part_label: str = "I"):
+def section_sort_key(section: Dict) -> List:
+    """Natural sort key on section_id, so 1.10 sorts after 1.2."""
+    return [int(x) if x.isdigit() else x
+            for x in _SORT_RE.split(section.get('section_id', '0'))]
+
+
+def list_section_files(sections_dir) -> List[Path]:
+    """Sorted section JSON files in sections_dir (empty if it doesn't exist).
+    os.scandir reads names and types in one pass over the directory.
+    """
+    try:
+        with os.scandir(sections_dir) as it:
+            names = [e.name for e in it if e.name.endswith(".json") and e.is_file()]
+    except FileNotFoundError:
+        return []
+    base = Path(sections_dir)
+    return [base / name for name in sorted(names)]
+
+
+def _load_json(path) -> Dict:
+    return jsonio.load_section(path)
+
+
+def load_json_files(json_files: List[Path], max_workers: int = 32) -> List[Dict]:
+    """Load section JSON files concurrently, preserving input order.
+    Small files are dominated by open/read latency, so threads overlap it.
+    """
+    if not json_files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(json_files))) as ex:
+        return list(ex.map(_load_json, json_files))
+
+
+def _render_section_file(path) -> Tuple[List, str]:
+    """Load and render one section file; runs in a worker process."""
+    section = _load_json(path)
+    return section_sort_key(section), generate_section_latex(section)
+
+
+def render_sections(json_files: List[Path], workers: Optional[int] = None) -> List[str]:
+    """Render section files to LaTeX fragments, ordered by section id.
+    Rendering is pure-Python regex work, so sections are spread over a
+    process pool; each worker loads its own files, so only paths and the
+    finished fragments cross process boundaries.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(json_files) < 2:
+        rendered = [_render_section_file(path) for path in json_files]
+    else:
+        with Pool(min(workers, len(json_files))) as pool:
+            rendered = pool.map(_render_section_file, json_files,
+                                chunksize=max(1, len(json_files) // (workers * 4)))
+    # Stable sort: ties keep file-name order, as before
+    rendered.sort(key=lambda r: r[0])
+    return [latex for _, latex in rendered]
+
+
+def generate_full_document(sections_dir: str, output_tex: str, part_label: str = "I",
+                           workers: Optional[int] = None):
     """Generate a complete LaTeX document from translated JSON files."""
     sections_path = Path(sections_dir)
-    json_files = sorted(sections_path.glob("*.json"))
+    json_files = list_section_files(sections_path)
 
     if not json_files:
         print(f"No JSON files found in {sections_dir}")
@@ -578,13 +623,7 @@ def generate_full_document(sections_dir: str, output_tex: str, part_label: str =
 
     print(f"Found {len(json_files)} sections")
 
-    sections = []
-    for jf in json_files:
-        with open(jf, 'r', encoding='utf-8') as f:
-            sections.append(json.load(f))
-
-    sections.sort(key=lambda s: [int(x) if x.isdigit() else x
-                                  for x in re.split(r'[._]', s.get('section_id', '0'))])
+    fragments = render_sections(json_files, workers)
 
     preamble = generate_preamble()
 
@@ -615,9 +654,7 @@ def generate_full_document(sections_dir: str, output_tex: str, part_label: str =
     body_parts.append(f"\\part{{제 {part_label} 부: 소개}}")
     body_parts.append("")
 
-    for section in sections:
-        latex = generate_section_latex(section)
-        body_parts.append(latex)
+    body_parts.extend(fragments)
 
     body_parts.append(r"\end{document}")
 
@@ -0,0 +1,87 @@
+"""
+JSON (de)serialization for section files.
+Uses orjson when it is installed and falls back to the stdlib json module;
+both write UTF-8 with 2-space indentation, so files are interchangeable.
+
+Large enrichment lists are kept out of the section file in a sidecar
+(sections/enrichments/<name>.json) and referenced by handle.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serialized enrichments above this size go to a sidecar file
+ENRICH_INLINE_LIMIT = 16_384
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, indented unless indent=False."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    return loads(Path(path).read_bytes())
+
+
+def dump_file(obj: Any, path: Union[str, Path]):
+    Path(path).write_bytes(dumps(obj))
+
+
+def _sidecar_dir(section_path: Path) -> Path:
+    return section_path.parent / "enrichments"
+
+
+def dump_section(section: dict, path: Union[str, Path]):
+    """Write a section file, moving oversized enrichments to a sidecar.
+    The sidecar is rewritten only when its content changed and removed once
+    the enrichments fit inline again. The section dict itself is left
+    unchanged.
+    """
+    path = Path(path)
+    sidecar = _sidecar_dir(path) / path.name
+    enrichments = section.get("enrichments")
+    blob = dumps(enrichments) if isinstance(enrichments, list) and enrichments else b""
+    if len(blob) > ENRICH_INLINE_LIMIT:
+        if not sidecar.exists() or sidecar.read_bytes() != blob:
+            sidecar.parent.mkdir(exist_ok=True)
+            sidecar.write_bytes(blob)
+        section = dict(section, enrichments={"_handle": path.stem,
+                                             "total": len(enrichments)})
+    elif sidecar.exists():
+        sidecar.unlink()
+    dump_file(section, path)
+
+
+def load_section(path: Union[str, Path]) -> dict:
+    """Read a section file, resolving an enrichments sidecar handle.
+    If the sidecar is gone, the enrichments come back empty and the enrich
+    cache key is dropped, so the next enrichment pass rebuilds them.
+    """
+    path = Path(path)
+    section = load_file(path)
+    enrichments = section.get("enrichments")
+    if isinstance(enrichments, dict) and "_handle" in enrichments:
+        sidecar = _sidecar_dir(path) / f"{enrichments['_handle']}.json"
+        if sidecar.exists():
+            section["enrichments"] = load_file(sidecar)
+        else:
+            section["enrichments"] = []
+            section.pop("_enrich_cache_key", None)
+    return section
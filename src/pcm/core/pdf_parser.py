@@ -5,12 +5,16 @@ Extracts text and images by hierarchical sections with proper spacing
 """
 
 import fitz  # PyMuPDF
-import json
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 from tqdm import tqdm
 
+from pcm.core import jsonio
+
 
 class PDFParser:
     def __init__(self, pdf_path: str, output_dir: str = "output"):
@@ -157,12 +161,42 @@ class PDFParser:
 
         return images
 
+    def iter_pages(self, start_page: int = 0, end_page: Optional[int] = None,
+                   workers: Optional[int] = None) -> Iterator[Tuple[int, str, List[Dict]]]:
+        """Yield (page_num, text, images) for each page in order.
+        Pages are extracted in a process pool; each worker opens its own
+        copy of the document, so only page numbers and results are sent
+        between processes. Workers are spawned rather than forked, since the
+        caller may already have threads running that hold locks.
+        """
+        end_page = min(end_page or len(self.doc), len(self.doc))
+        pages = range(start_page, end_page)
+        workers = min(workers or os.cpu_count() or 1, len(pages))
+        if workers <= 1:
+            for page_num in pages:
+                yield (page_num, self.extract_text_from_page(page_num),
+                       self.extract_images_from_page(page_num))
+            return
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_page_worker,
+                                 initargs=(self.pdf_path, str(self.output_dir))) as ex:
+            yield from ex.map(_extract_page, pages,
+                              chunksize=max(1, len(pages) // (workers * 4)))
+
     def parse_full_document(self, start_page: int = 0, end_page: Optional[int] = None) -> Dict:
         """Parse the document and extract sections with proper text."""
+        return dict(self.iter_sections(start_page, end_page))
+
+    def iter_sections(self, start_page: int = 0,
+                      end_page: Optional[int] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield (section_id, section_data) as each section is completed, i.e.
+        when the next section heading is found, so callers can start work on
+        a section while later pages are still being parsed.
+        """
         if end_page is None:
             end_page = len(self.doc)
 
-        all_sections = {}
         current_section = None
         current_content = []
         current_images = []
@@ -178,9 +212,9 @@ class PDFParser:
             sections = self.detect_sections_by_font(page_num)
 
             if sections:
-                # Save previous section
+                # Emit previous section
                 if current_section:
-                    all_sections[current_section["section_id"]] = {
+                    yield current_section["section_id"], {
                         **current_section,
                         "content_original": "\n".join(current_content),
                         "images": current_images,
@@ -206,44 +240,61 @@ class PDFParser:
                     current_content.append(text)
                 current_images.extend(images)
 
-        # Save last section
+        # Emit last section
         if current_section:
-            all_sections[current_section["section_id"]] = {
+            yield current_section["section_id"], {
                 **current_section,
                 "content_original": "\n".join(current_content),
                 "images": current_images,
                 "page_range": [page_range_start + 1, end_page]
             }
 
-        return all_sections
+    def save_single_section(self, section_id: str, section_data: Dict) -> Path:
+        """Save one section to its JSON file, replacing any earlier version."""
+        safe_filename = section_id.replace(".", "_") + ".json"
+        output_path = self.sections_dir / safe_filename
+        jsonio.dump_section(section_data, output_path)
+        return output_path
 
     def save_sections_to_json(self, sections: Dict):
         """Save each section to a separate JSON file."""
         for section_id, section_data in sections.items():
-            safe_filename = section_id.replace(".", "_") + ".json"
-            output_path = self.sections_dir / safe_filename
-
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(section_data, f, ensure_ascii=False, indent=2)
-
+            output_path = self.save_single_section(section_id, section_data)
             print(f"Saved section {section_id} to {output_path}")
 
-    def save_metadata(self, sections: Dict):
-        """Save overall metadata."""
+    def save_metadata(self, sections: Dict, pdf_hash: Optional[str] = None):
+        """Save overall metadata. pdf_hash identifies the input PDF the
+        section files were produced from, for checkpoint resume."""
         metadata = {
             "total_sections": len(sections),
             "section_ids": list(sections.keys()),
             "pdf_path": self.pdf_path,
+            "pdf_hash": pdf_hash,
             "total_pages": len(self.doc)
         }
 
         metadata_path = self.output_dir / "metadata.json"
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        jsonio.dump_file(metadata, metadata_path)
 
         print(f"Saved metadata to {metadata_path}")
 
 
+# Per-process parser used by iter_pages workers
+_worker_parser = None
+
+
+def _init_page_worker(pdf_path: str, output_dir: str):
+    global _worker_parser
+    # Opened the same way as `with PDFParser(...)`, one handle per worker;
+    # it lives until the worker process exits
+    _worker_parser = PDFParser(pdf_path, output_dir).__enter__()
+
+
+def _extract_page(page_num: int) -> Tuple[int, str, List[Dict]]:
+    return (page_num, _worker_parser.extract_text_from_page(page_num),
+            _worker_parser.extract_images_from_page(page_num))
+
+
 def main():
     import argparse
 
@@ -0,0 +1,71 @@
+"""
+Shared HTTP sessions for the Ollama clients.
+A pooled requests.Session keeps connections to the server alive across
+calls instead of opening a new TCP connection per request.
+"""
+
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pcm.core import jsonio
+from pcm.core.concurrency import DEFAULT_PARALLEL
+
+# How long Ollama keeps a model loaded after its last request: long enough
+# to avoid reloads between sections, short enough that the models are
+# unloaded again once the run is over
+OLLAMA_KEEP_ALIVE = "30m"
+
+
+def make_session(pool_size: int = DEFAULT_PARALLEL, hosts: int = 1,
+                 retries: int = 0) -> requests.Session:
+    """Session whose connection pool holds pool_size keep-alive connections
+    per host, enough for every concurrent caller to reuse one. hosts is the
+    number of distinct hosts the session talks to; fewer host pools than
+    hosts would make alternating requests evict each other's connections.
+    retries > 0 retries failed connections, and GETs answered with 429/5xx,
+    with backoff; POSTs (generation requests) are never resent once sent.
+    """
+    session = requests.Session()
+    max_retries = Retry(total=retries, backoff_factor=0.3,
+                        status_forcelist=(429, 500, 502, 503, 504)) if retries else 0
+    adapter = HTTPAdapter(pool_connections=max(hosts, 1), pool_maxsize=max(pool_size, 1),
+                          max_retries=max_retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_json(session: requests.Session, url: str, payload: Dict,
+              **kwargs) -> requests.Response:
+    """session.post(url, json=payload, ...), with the body written by jsonio:
+    orjson when installed, and raw UTF-8 rather than the stdlib's \\uXXXX
+    escapes, which make Korean prompts twice as large."""
+    return session.post(url, data=jsonio.dumps(payload, indent=False),
+                        headers={"Content-Type": "application/json"}, **kwargs)
+
+
+# Model names per Ollama base URL, from the first successful /api/tags call
+_installed_models: Dict[str, List[str]] = {}
+
+
+def ollama_models(session: requests.Session, base_url: str) -> List[str]:
+    """Names of the models installed on the Ollama server at base_url.
+    Fetched once per server for the life of the process, so the clients of
+    one run share a single probe; failures are not remembered.
+    Raises requests.exceptions.RequestException on network errors or a
+    malformed response.
+    """
+    models = _installed_models.get(base_url)
+    if models is None:
+        response = session.get(f"{base_url}/api/tags", timeout=5)
+        response.raise_for_status()
+        try:
+            tags = jsonio.loads(response.content)
+        except ValueError as e:
+            raise requests.exceptions.RequestException(e, response=response)
+        models = [m["name"] for m in tags.get("models", [])]
+        _installed_models[base_url] = models
+    return models
@@ -11,13 +11,19 @@ import re
 import time
 from typing import Dict, List, Optional
 
+from pcm.core.concurrency import DEFAULT_PARALLEL
+from pcm.core import jsonio
+from pcm.core.sessions import OLLAMA_KEEP_ALIVE, make_session, ollama_models, post_json
+
 
 class SupplementGenerator:
     def __init__(self, model_name: str = "qwen2.5-coder:7b",
-                 base_url: str = "http://localhost:11434"):
+                 base_url: str = "http://localhost:11434",
+                 pool_size: int = DEFAULT_PARALLEL):
         self.model_name = model_name
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
+        self.session = make_session(pool_size)
 
     def _call_ollama(self, prompt: str, temperature: float = 0.4,
                      max_tokens: int = 4096) -> str:
@@ -26,6 +32,7 @@ class SupplementGenerator:
             "model": self.model_name,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
@@ -36,10 +43,10 @@ class SupplementGenerator:
         }
 
         try:
-            response = requests.post(self.api_url, json=payload, timeout=300)
+            response = post_json(self.session, self.api_url, payload, timeout=300)
             response.raise_for_status()
-            return response.json().get("response", "").strip()
-        except requests.exceptions.RequestException as e:
+            return jsonio.loads(response.content).get("response", "").strip()
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"  Ollama error: {e}")
             return ""
 
@@ -341,13 +348,14 @@ Terms:"""
 
         return entries[:8]  # Max 8 terms
 
+    def close(self):
+        """Release pooled HTTP connections."""
+        self.session.close()
+
     def test_connection(self) -> bool:
         """Test if the model is available."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            response.raise_for_status()
-            models = response.json().get("models", [])
-            model_names = [m["name"] for m in models]
+            model_names = ollama_models(self.session, self.base_url)
 
             if self.model_name in model_names:
                 print(f"Supplement model '{self.model_name}' is available")
@@ -360,6 +368,16 @@ Terms:"""
             print(f"Cannot connect to Ollama: {e}")
             return False
 
+    def warmup(self):
+        """Load the model with an empty prompt and keep it loaded."""
+        try:
+            post_json(self.session, self.api_url,
+                      {"model": self.model_name, "prompt": "", "stream": False,
+                       "keep_alive": OLLAMA_KEEP_ALIVE},
+                      timeout=300)
+        except requests.exceptions.RequestException:
+            pass  # the first real request loads the model instead
+
 
 def main():
     """Test the supplement generator."""
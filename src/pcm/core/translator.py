@@ -6,11 +6,22 @@ Translator module using Ollama with quality checks and polishing
 import requests
 import json
 import re
-import time
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 from tqdm import tqdm
 
+from pcm.core.cache import hash_key
+from pcm.core.concurrency import DEFAULT_PARALLEL
+from pcm.core import jsonio
+from pcm.core.sessions import OLLAMA_KEEP_ALIVE, make_session, ollama_models, post_json
+
+# Bump when the translate/polish prompts change so cached translations
+# made with the old prompts are not reused
+PROMPT_VERSION = "1"
+
 # Standard math terminology mapping (English → Korean)
 MATH_GLOSSARY = {
     "group": "군",
@@ -99,22 +110,43 @@ MATH_GLOSSARY = {
 }
 
 
+def iter_glossary_terms(text: str,
+                        glossary: Dict[str, str] = MATH_GLOSSARY) -> Iterator[Tuple[str, str]]:
+    """Yield (English, Korean) glossary entries whose English term occurs in
+    text (case-insensitively), in glossary order. Lazy, so callers that
+    need only the first few hits stop scanning early."""
+    text_lower = text.lower()
+    for eng, kor in glossary.items():
+        if eng.lower() in text_lower:
+            yield eng, kor
+
+
+# Prefix of the text translate_text returns when a request fails
+TRANSLATION_ERROR_MARK = "[TRANSLATION ERROR"
+
+
 class OllamaTranslator:
-    def __init__(self, model_name: str = "gemma2:9b", base_url: str = "http://localhost:11434"):
+    def __init__(self, model_name: str = "gemma2:9b", base_url: str = "http://localhost:11434",
+                 pool_size: int = DEFAULT_PARALLEL):
         self.model_name = model_name
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.glossary = MATH_GLOSSARY
+        # Keep-alive connections for every request that may be in flight at once
+        self.session = make_session(pool_size)
+        # Caps in-flight Ollama calls (chunks, polish passes and titles of
+        # every section using this translator) at pool_size
+        self._ollama_slots = threading.BoundedSemaphore(max(1, pool_size))
+        # Chunks of one section are independent, so up to this many are
+        # sent to Ollama together
+        self.max_parallel_chunks = DEFAULT_PARALLEL
 
     def _build_glossary_hint(self, text: str) -> str:
         """Build glossary hints for terms found in the text."""
-        hints = []
-        text_lower = text.lower()
-        for eng, kor in self.glossary.items():
-            if eng.lower() in text_lower:
-                hints.append(f"  {eng} → {kor}")
+        hints = [f"  {eng} → {kor}"
+                 for eng, kor in islice(iter_glossary_terms(text, self.glossary), 15)]
         if hints:
-            return "수학 용어 참조:\n" + "\n".join(hints[:15])  # max 15 terms
+            return "수학 용어 참조:\n" + "\n".join(hints)  # max 15 terms
         return ""
 
     def translate_text(self, text: str, context: str = "") -> str:
@@ -148,6 +180,7 @@ Korean translation:"""
             "model": self.model_name,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": 0.3,
                 "num_predict": 4096,
@@ -159,14 +192,15 @@ Korean translation:"""
         }
 
         try:
-            response = requests.post(self.api_url, json=payload, timeout=300)
-            response.raise_for_status()
-            result = response.json()
+            with self._ollama_slots:
+                response = post_json(self.session, self.api_url, payload, timeout=300)
+                response.raise_for_status()
+            result = jsonio.loads(response.content)
             translated = result.get("response", "").strip()
             return self._quality_check(translated)
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"Translation error: {e}")
-            return f"[TRANSLATION ERROR: {str(e)}]"
+            return f"{TRANSLATION_ERROR_MARK}: {str(e)}]"
 
     def _quality_check(self, text: str) -> str:
         """Post-translation quality check: remove CJK noise, English blocks, repetitions."""
@@ -271,6 +305,7 @@ Korean translation:"""
             "model": self.model_name,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": 0.2,
                 "num_predict": 4096,
@@ -280,68 +315,82 @@ Korean translation:"""
         }
 
         try:
-            response = requests.post(self.api_url, json=payload, timeout=300)
-            response.raise_for_status()
-            result = response.json()
+            with self._ollama_slots:
+                response = post_json(self.session, self.api_url, payload, timeout=300)
+                response.raise_for_status()
+            result = jsonio.loads(response.content)
             polished = result.get("response", "").strip()
             polished = self._quality_check(polished)
             # If polishing made it worse (much shorter), keep original
             if len(polished) < len(translated) * 0.5:
                 return translated
             return polished
-        except requests.exceptions.RequestException:
+        except (requests.exceptions.RequestException, ValueError):
             return translated  # fallback to unpolished
 
+    def cache_key(self, section_data: Dict, do_polish: bool = True) -> str:
+        """Key identifying translate_section's output for this section's inputs."""
+        return hash_key(PROMPT_VERSION, self.model_name, str(do_polish),
+                        section_data.get("title_original", ""),
+                        section_data.get("content_original", ""))
+
     def translate_section(self, section_data: Dict, do_polish: bool = True) -> Dict:
         """Translate a complete section with optional polishing."""
         print(f"Translating section {section_data.get('section_id', 'unknown')}...")
 
-        # Translate title
-        if section_data.get("title_original"):
-            print(f"  Translating title...")
-            section_data["title_translated"] = self.translate_text(
-                section_data["title_original"],
-                context="section title"
-            )
-            time.sleep(0.5)
-
-        # Translate content
-        if section_data.get("content_original"):
-            content = section_data["content_original"]
-            print(f"  Translating content ({len(content)} chars)...")
-
-            max_chunk_size = 2000  # smaller chunks for better quality
-            if len(content) > max_chunk_size:
-                chunks = self._split_into_chunks(content, max_chunk_size)
-                translated_chunks = []
-
-                for chunk in tqdm(chunks, desc="  Chunks", leave=False):
-                    translated_chunk = self.translate_text(chunk)
-                    translated_chunks.append(translated_chunk)
-                    time.sleep(0.5)
-
-                translated = "\n\n".join(translated_chunks)
-            else:
-                translated = self.translate_text(content)
-
-            # 2nd pass: polish
-            if do_polish:
-                print(f"  Polishing translation...")
-                # Polish in chunks too if long
-                if len(translated) > 2000:
-                    polish_chunks = self._split_into_chunks(translated, 2000)
-                    polished_chunks = []
-                    for pc in polish_chunks:
-                        polished_chunks.append(self.polish_text(pc))
-                        time.sleep(0.5)
-                    translated = "\n\n".join(polished_chunks)
+        # Translate title alongside the content, so the short title request
+        # shares the server's parallel slots instead of a round trip of its own
+        with ThreadPoolExecutor(max_workers=1) as title_ex:
+            title_future = None
+            if section_data.get("title_original"):
+                print(f"  Translating title...")
+                title_future = title_ex.submit(self.translate_text,
+                                               section_data["title_original"],
+                                               context="section title")
+
+            # Translate content
+            if section_data.get("content_original"):
+                content = section_data["content_original"]
+                print(f"  Translating content ({len(content)} chars)...")
+
+                max_chunk_size = 2000  # smaller chunks for better quality
+                if len(content) > max_chunk_size:
+                    chunks = self._split_into_chunks(content, max_chunk_size)
+                    translated_chunks = self._map_chunks(self.translate_text, chunks)
+                    translated = "\n\n".join(translated_chunks)
                 else:
-                    translated = self.polish_text(translated)
-
-            section_data["content_translated"] = translated
-
+                    translated = self.translate_text(content)
+
+                # 2nd pass: polish
+                if do_polish:
+                    print(f"  Polishing translation...")
+                    # Polish in chunks too if long
+                    if len(translated) > 2000:
+                        polish_chunks = self._split_into_chunks(translated, 2000)
+                        polished_chunks = self._map_chunks(self.polish_text, polish_chunks)
+                        translated = "\n\n".join(polished_chunks)
+                    else:
+                        translated = self.polish_text(translated)
+
+                section_data["content_translated"] = translated
+
+            if title_future is not None:
+                section_data["title_translated"] = title_future.result()
+
+        # A chunk or the title that failed leaves its error marker in the
+        # text; callers must not cache or skip such a section on resume
+        section_data["translation_failed"] = any(
+            TRANSLATION_ERROR_MARK in section_data.get(field, "")
+            for field in ("title_translated", "content_translated"))
         return section_data
 
+    def _map_chunks(self, fn, chunks: List[str]) -> List[str]:
+        """Apply fn to every chunk concurrently, keeping chunk order."""
+        workers = max(1, min(self.max_parallel_chunks, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            return list(tqdm(ex.map(fn, chunks), total=len(chunks),
+                             desc="  Chunks", leave=False))
+
     def _split_into_chunks(self, text: str, max_size: int) -> List[str]:
         """Split text into chunks at paragraph boundaries."""
         paragraphs = text.split("\n\n")
@@ -364,16 +413,16 @@ Korean translation:"""
 
         return chunks
 
+    def close(self):
+        """Release pooled HTTP connections."""
+        self.session.close()
+
     def test_connection(self) -> bool:
         """Test if Ollama server is accessible."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            response.raise_for_status()
+            model_names = ollama_models(self.session, self.base_url)
             print(f"Connected to Ollama at {self.base_url}")
 
-            models = response.json().get("models", [])
-            model_names = [m["name"] for m in models]
-
             if self.model_name in model_names:
                 print(f"Model '{self.model_name}' is available")
                 return True
@@ -390,6 +439,17 @@ Korean translation:"""
             print(f"Cannot connect to Ollama: {e}")
             return False
 
+    def warmup(self):
+        """Load the model with an empty prompt and keep it loaded, so the
+        first section does not pay the model-load latency."""
+        try:
+            post_json(self.session, self.api_url,
+                      {"model": self.model_name, "prompt": "", "stream": False,
+                       "keep_alive": OLLAMA_KEEP_ALIVE},
+                      timeout=300)
+        except requests.exceptions.RequestException:
+            pass  # the first real request loads the model instead
+
 
 def main():
     """Test the translator."""
@@ -8,12 +8,65 @@ Uses Ollama LLMs + rule-based checks + Wikipedia API for fact verification.
 import requests
 import json
 import re
-import time
+import threading
 import urllib.parse
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 # Reuse the standard glossary from translator
-from pcm.core.translator import MATH_GLOSSARY
+from pcm.core.translator import MATH_GLOSSARY, iter_glossary_terms
+from pcm.core.concurrency import DEFAULT_PARALLEL, RateLimiter, bounded_map
+from pcm.core.cache import DiskCache, hash_key
+from pcm.core import jsonio
+from pcm.core.sessions import OLLAMA_KEEP_ALIVE, make_session, ollama_models, post_json
+
+# Bump when scoring changes so reports scored the old way are redone
+# rather than reused
+SCORING_VERSION = "2"
+
+# Fixed instruction blocks go first in every prompt and the section text
+# last, so Ollama can reuse the cached prefix across calls
+SEMANTIC_SCORE_INSTRUCTIONS = """Compare English math text with its Korean translation.
+Rate semantic preservation on a scale of 1-10:
+- 10: Perfect meaning preservation
+- 7-9: Minor omissions/additions but core meaning intact
+- 4-6: Some meaning lost or distorted
+- 1-3: Severely distorted or mostly wrong
+[MATH_n] placeholders stand for formulas; the same placeholder is the same formula.
+"""
+
+EXTRACT_CLAIMS_INSTRUCTIONS = """Extract verifiable factual claims from a math text.
+Focus on: theorem attributions, dates, numerical values, definitions, named results.
+List up to 6 claims, one per line. Each claim should be a single clear statement.
+Output ONLY the claims, one per line.
+"""
+
+CLAIM_PRESERVED_INSTRUCTIONS = """Check whether factual claims from an English math text are preserved in its Korean translation.
+[MATH_n] placeholders stand for formulas; the same placeholder is the same formula.
+"""
+
+INTERNAL_LOGIC_INSTRUCTIONS = """Analyze a Korean math translation for internal logic issues.
+Look for: contradictions, variable inconsistencies, broken definitions.
+If no issues found, respond: {"issues": []}
+If issues found, respond: {"issues": ["issue1", "issue2"]}
+Respond in JSON only.
+"""
+
+FACT_CHECK_INSTRUCTIONS = """Decide whether a Wikipedia extract supports or contradicts a claim.
+Respond in JSON:
+{"supported": true/false, "note": "<brief explanation>"}
+"""
+
+
+def _compile_linear(pattern: str):
+    """Compile with RE2, which matches in linear time, when google-re2 is
+    installed; otherwise with re. pattern must not use lookaround."""
+    return re2.compile(pattern) if re2 is not None else re.compile(pattern)
 
 
 class CheckResult:
@@ -77,15 +130,98 @@ class TranslationVerifier:
     # Variable patterns (single letters, possibly with subscripts/superscripts)
     VAR_PATTERN = r'(?<![a-zA-Z\\])([A-Za-z])(?:_\{?[^}\s]*\}?)?(?:\^\{?[^}\s]*\}?)?'
 
+    # Commands whose backslash the model tends to drop (auto-fix 3)
+    BROKEN_COMMANDS = ['frac', 'sum', 'prod', 'int', 'lim', 'sqrt', 'log', 'ln',
+                       'sin', 'cos', 'tan', 'exp', 'infty', 'partial', 'nabla']
+
+    # Compiled once at class load rather than looked up in re's shared
+    # pattern cache on every call
+    _MATH_RES = [re.compile(p, re.DOTALL) for p in MATH_PATTERNS]
+    # All math regions in one pass, display math tried before inline
+    _MATH_REGION_RE = re.compile("|".join(
+        MATH_PATTERNS[1:2] + MATH_PATTERNS[:1] + MATH_PATTERNS[2:]), re.DOTALL)
+    # Math regions at most this long are left in prompts as they are, since
+    # a placeholder would not be shorter
+    MASK_MIN_LEN = 12
+    # All LATEX_COMMANDS in one alternation, so the text is scanned once.
+    # Bare command names must end at a non-letter, as in LaTeX itself, so
+    # \int is one token rather than also yielding \in.
+    _LATEX_RE = re.compile("|".join(
+        p if p.endswith("}") else p + r"(?![a-zA-Z])" for p in LATEX_COMMANDS
+    ))
+    _VAR_RE = re.compile(VAR_PATTERN)
+    _BROKEN_CMD_RE = re.compile(rf'(?<!\\)({"|".join(BROKEN_COMMANDS)})(?=[\s{{(])')
+    # Run over LLM output and translated text of any size; with re, many
+    # unclosed tags make these quadratic
+    _HTML_SUP_RE = _compile_linear(r'<sup>(.*?)</sup>')
+    _HTML_SUB_RE = _compile_linear(r'<sub>(.*?)</sub>')
+    _THINK_RE = _compile_linear(r'(?s)<think>.*?</think>')
+    # Numbering ("1." / "2)") and/or a bullet at the start of an LLM list line
+    _LIST_MARKER_RE = re.compile(r'^(?:\d+[\.\)]\s*)?(?:[-*]\s*)?')
+    _INTRO_RE = re.compile(r'(Here is|Below is|다음은|아래는).*?\n')
+    # Common words left out of Wikipedia search terms
+    _STOPWORDS = frozenset({
+        'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+        'has', 'have', 'had', 'do', 'does', 'did', 'will', 'would',
+        'could', 'should', 'may', 'might', 'can', 'shall', 'that',
+        'this', 'these', 'those', 'it', 'its', 'of', 'in', 'on',
+        'at', 'to', 'for', 'with', 'by', 'from', 'as', 'or', 'and',
+        'not', 'no', 'but', 'if', 'then', 'than', 'so', 'very',
+    })
+    _NON_TERM_RE = re.compile(r'[^a-zA-Z0-9\-\s]')
+    # Glossary terms worth flagging; very short terms like "ring", "field"
+    # are skipped
+    _GLOSSARY_CHECKED = {eng: kor for eng, kor in MATH_GLOSSARY.items() if len(eng) > 4}
+    # Korean glossary terms by lowercased English term, for concept titles
+    _GLOSSARY_TITLES = {eng.lower(): kor for eng, kor in MATH_GLOSSARY.items()}
+
+    WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+    WIKI_HEADERS = {"User-Agent": "PCMTranslationVerifier/1.0 (educational project)"}
+    # Context window for every verifier request. Batched prompts outgrow
+    # Ollama's default; the warmup load uses the same value, since a request
+    # with a different num_ctx makes Ollama reload the model
+    NUM_CTX = 8192
+    # Wikipedia requests per second, across all threads using a verifier
+    WIKI_RATE = 5
+    # Cached Wikipedia responses older than this are fetched again
+    WIKI_CACHE_MAX_AGE = 7 * 24 * 3600
+    # Claims fact-checked against Wikipedia at once
+    WIKI_PARALLEL = 3
+
     def __init__(self, model_name: str = "qwen2.5:14b",
                  base_url: str = "http://localhost:11434",
                  verify_types: List[str] = None,
-                 research_model: str = "deepseek-r1:7b"):
+                 research_model: str = "deepseek-r1:7b",
+                 pool_size: int = DEFAULT_PARALLEL,
+                 cache_path: Optional[str] = None):
         self.model_name = model_name
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.research_model = research_model
         self.verify_types = verify_types or ["formula", "semantic", "logic", "research"]
+        # Shared by Ollama and Wikipedia calls, one keep-alive pool per host;
+        # transient Wikipedia errors (429/5xx) are retried with backoff
+        self.session = make_session(pool_size, hosts=2, retries=3)
+        # Caps in-flight Ollama calls across all threads using this verifier
+        self._ollama_slots = threading.BoundedSemaphore(max(1, pool_size))
+        # Responses by (model, prompt, options): in memory for this run, and
+        # on disk across runs when cache_path is given
+        self._llm_memo = {}
+        self._llm_cache = DiskCache(cache_path, table="llm") if cache_path else None
+        # Wikipedia API responses, cached the same way
+        self._wiki_memo = {}
+        self._wiki_cache = DiskCache(cache_path, table="wikipedia") if cache_path else None
+        # Guards eviction and insertion in both memos, which many worker
+        # threads update at once
+        self._memo_lock = threading.Lock()
+        self._wiki_limiter = RateLimiter(self.WIKI_RATE, burst=self.WIKI_RATE)
+        # Requests (Ollama prompts, Wikipedia queries) in flight, so that
+        # identical ones made at the same time are sent only once
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # Enrichment notes by lowercased concept, so a concept that comes up
+        # in several sections of a run is researched once
+        self._concept_notes = {}
 
         # Weights for final score
         self.weights = {
@@ -96,57 +232,186 @@ class TranslationVerifier:
         }
 
     def _call_ollama(self, prompt: str, temperature: float = 0.2,
-                     max_tokens: int = 2048, model: str = None) -> str:
-        """Call Ollama API and return the response text."""
+                     max_tokens: int = 2048, model: str = None,
+                     stop: Optional[Callable[[str], bool]] = None) -> str:
+        """Call Ollama API and return the response text.
+        With stop, the response is streamed and generation is abandoned as
+        soon as stop(text so far) is true, e.g. once enough lines arrived.
+        """
         use_model = model or self.model_name
         prompt_text = prompt
 
+        key = hash_key(use_model, prompt_text, str(temperature), str(max_tokens),
+                       stop.__qualname__ if stop else "")
+        cached = self._llm_memo.get(key)
+        if cached is None and self._llm_cache is not None:
+            hit = self._llm_cache.get(key)
+            if hit is not None:
+                cached = self._remember(self._llm_memo, key, hit.decode("utf-8"))
+        if cached is not None:
+            return cached
+
         # Qwen3 uses thinking tokens that count toward num_predict,
-        # so we need extra budget beyond the desired output tokens
+        # so we need extra budget beyond the desired output tokens;
+        # short answers get less room to think than long ones
         predict_budget = max_tokens
         if "qwen3" in use_model.lower():
-            predict_budget = max_tokens + 3000  # extra for thinking
+            predict_budget = max_tokens + min(3000, max(1500, max_tokens * 4))
 
         payload = {
             "model": use_model,
             "prompt": prompt_text,
-            "stream": False,
+            "stream": stop is not None,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": temperature,
                 "num_predict": predict_budget,
+                "num_ctx": self.NUM_CTX,
                 "repeat_penalty": 1.1,
                 "top_k": 40,
                 "top_p": 0.9,
             }
         }
 
-        try:
-            response = requests.post(self.api_url, json=payload, timeout=600)
+        def generate() -> str:
+            try:
+                with self._ollama_slots:
+                    if stop is None:
+                        response = post_json(self.session, self.api_url, payload, timeout=600)
+                        response.raise_for_status()
+                        text = jsonio.loads(response.content).get("response", "")
+                    else:
+                        text = self._stream_ollama(payload, stop)
+                # Strip <think>...</think> blocks if present (Qwen3 thinking mode)
+                text = self._THINK_RE.sub('', text).strip()
+                if text:
+                    self._remember(self._llm_memo, key, text)
+                    if self._llm_cache is not None:
+                        self._llm_cache.put(key, text.encode("utf-8"))
+                return text
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"  Ollama error: {e}")
+                return ""
+
+        return self._shared_call(("ollama", key), generate)
+
+    def _stream_ollama(self, payload: Dict, stop: Callable[[str], bool]) -> str:
+        """Read a streamed generation until it is done or stop() says the
+        visible text (thinking excluded) is enough. Closing the response
+        early makes Ollama stop generating.
+        The visible text is built as chunks arrive, so each chunk costs
+        only its own length even when the model thinks for thousands of
+        tokens."""
+        parts = []
+        visible = ""
+        checked = 0  # len(visible) when stop() last saw it
+        # Unscanned text: a chunk may end part-way through a think tag
+        pending = ""
+        thinking = False
+        with post_json(self.session, self.api_url, payload, timeout=600,
+                       stream=True) as response:
             response.raise_for_status()
-            text = response.json().get("response", "").strip()
-            # Strip <think>...</think> blocks if present (Qwen3 thinking mode)
-            text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL).strip()
-            return text
-        except requests.exceptions.RequestException as e:
-            print(f"  Ollama error: {e}")
-            return ""
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = jsonio.loads(line)
+                piece = chunk.get("response", "")
+                parts.append(piece)
+                if chunk.get("done"):
+                    break
+                pending += piece
+                while pending:
+                    tag = "</think>" if thinking else "<think>"
+                    i = pending.find(tag)
+                    if i == -1:
+                        # Hold back a tail that could be the start of tag
+                        keep = next((k for k in range(min(len(tag) - 1, len(pending)), 0, -1)
+                                     if pending.endswith(tag[:k])), 0)
+                        if not thinking:
+                            visible += pending[:len(pending) - keep]
+                        pending = pending[len(pending) - keep:] if keep else ""
+                        break
+                    if not thinking:
+                        visible += pending[:i]
+                    pending = pending[i + len(tag):]
+                    thinking = not thinking
+                if not thinking and len(visible) != checked:
+                    checked = len(visible)
+                    if stop(visible):
+                        break
+        return "".join(parts)
+
+    def _remember(self, memo: Dict, key: str, value):
+        with self._memo_lock:
+            if len(memo) >= 4096:
+                # Evict the oldest entry
+                memo.pop(next(iter(memo)), None)
+            memo[key] = value
+        return value
+
+    def _shared_call(self, key: Tuple[str, str], fn: Callable[[], Any]):
+        """fn() for the first caller with key; callers that arrive with the
+        same key while it runs wait for it and get its result (or
+        exception) instead of sending the same request again."""
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return pending.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _map(self, fn, items, workers: Optional[int] = None) -> List:
+        """fn over items concurrently (at most workers at a time), results in
+        input order. The number of Ollama calls actually in flight is capped
+        by _ollama_slots."""
+        items = list(items)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(workers or len(items), len(items))) as ex:
+            return list(ex.map(fn, items))
+
+    _JSON_DECODER = json.JSONDecoder()
+
+    def _has_json_object(self, partial: str) -> bool:
+        """Stream stop: the object opened by the first '{' is complete."""
+        start = partial.find("{")
+        if start == -1 or not partial.rstrip().endswith("}"):
+            return False
+        try:
+            self._JSON_DECODER.raw_decode(partial, start)
+            return True
+        except json.JSONDecodeError:
+            return False
 
     def _parse_json_response(self, text: str) -> Optional[Dict]:
-        """Extract JSON object from LLM response."""
+        """Extract the first JSON object from an LLM response, which may be
+        wrapped in prose or code fences and nested to any depth."""
         if not text:
             return None
-        # Try to find JSON block
-        match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text, re.DOTALL)
-        if match:
+        start = text.find("{")
+        while start != -1:
             try:
-                return json.loads(match.group(0))
+                parsed, _ = self._JSON_DECODER.raw_decode(text, start)
+                if isinstance(parsed, dict):
+                    return parsed
             except json.JSONDecodeError:
                 pass
-        # Try the whole text
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return None
+            start = text.find("{", start + 1)
+        return None
 
     # ═══════════════════════════════════════════════════════════
     # Module 1: Formula Integrity (90% rule-based, 10% LLM)
@@ -154,25 +419,19 @@ class TranslationVerifier:
 
     def _extract_math_tokens(self, text: str) -> List[str]:
         """Extract all math expressions and LaTeX commands from text."""
-        tokens = []
-
         # Extract full math regions
-        for pattern in self.MATH_PATTERNS:
-            for match in re.finditer(pattern, text, re.DOTALL):
-                tokens.append(match.group(0))
+        math_regions = []
+        for pattern in self._MATH_RES:
+            math_regions.extend(pattern.findall(text))
+        tokens = list(math_regions)
 
         # Extract LaTeX commands
-        for pattern in self.LATEX_COMMANDS:
-            for match in re.finditer(pattern, text):
-                tokens.append(match.group(0))
+        tokens.extend(m.group(0) for m in self._LATEX_RE.finditer(text))
 
         # Extract standalone variables in math context
         # Only look inside math delimiters to reduce false positives
-        math_regions = []
-        for pattern in self.MATH_PATTERNS:
-            math_regions.extend(re.findall(pattern, text, re.DOTALL))
         for region in math_regions:
-            for match in re.finditer(self.VAR_PATTERN, region):
+            for match in self._VAR_RE.finditer(region):
                 tokens.append(match.group(0))
 
         return tokens
@@ -192,7 +451,6 @@ class TranslationVerifier:
         trans_set = set(trans_tokens)
 
         missing = orig_set - trans_set
-        extra = trans_set - orig_set
 
         issues = []
         auto_fixed = []
@@ -200,21 +458,19 @@ class TranslationVerifier:
 
         # ── Rule-based auto-fixes ──
 
-        # Fix 1: HTML sup/sub → LaTeX
-        html_sup = re.findall(r'<sup>(.*?)</sup>', fixed_text)
-        if html_sup:
-            for s in html_sup:
-                fixed_text = fixed_text.replace(f'<sup>{s}</sup>', f'^{{{s}}}')
-            auto_fixed.append(f"Converted {len(html_sup)} HTML superscripts to LaTeX")
+        # Fix 1: HTML sup/sub → LaTeX, one pass over the text each
+        if "<sup>" in fixed_text:
+            fixed_text, n_sup = self._HTML_SUP_RE.subn(r'^{\1}', fixed_text)
+            if n_sup:
+                auto_fixed.append(f"Converted {n_sup} HTML superscripts to LaTeX")
 
-        html_sub = re.findall(r'<sub>(.*?)</sub>', fixed_text)
-        if html_sub:
-            for s in html_sub:
-                fixed_text = fixed_text.replace(f'<sub>{s}</sub>', f'_{{{s}}}')
-            auto_fixed.append(f"Converted {len(html_sub)} HTML subscripts to LaTeX")
+        if "<sub>" in fixed_text:
+            fixed_text, n_sub = self._HTML_SUB_RE.subn(r'_{\1}', fixed_text)
+            if n_sub:
+                auto_fixed.append(f"Converted {n_sub} HTML subscripts to LaTeX")
 
         # Fix 2: Restore missing dollar-sign delimited formulas
-        for token in missing.copy():
+        for token in sorted(missing):
             if token.startswith('$') and token.endswith('$'):
                 inner = token[1:-1] if not token.startswith('$$') else token[2:-2]
                 # Check if the inner content exists without delimiters
@@ -223,31 +479,41 @@ class TranslationVerifier:
                     auto_fixed.append(f"Restored math delimiters: {token[:40]}")
                     missing.discard(token)
 
-        # Fix 3: Fix broken LaTeX commands (missing backslash)
-        for cmd in ['frac', 'sum', 'prod', 'int', 'lim', 'sqrt', 'log', 'ln',
-                     'sin', 'cos', 'tan', 'exp', 'infty', 'partial', 'nabla']:
-            broken = re.findall(rf'(?<!\\){cmd}(?=[\s{{(])', fixed_text)
-            if broken:
-                fixed_text = re.sub(rf'(?<!\\)({cmd})(?=[\s{{(])', rf'\\{cmd}', fixed_text)
+        # Fix 3: Fix broken LaTeX commands (missing backslash), only for
+        # commands some missing token actually needs
+        wanted = {cmd for cmd in self.BROKEN_COMMANDS
+                  if any(f'\\{cmd}' in token for token in missing)}
+        restored = set()
+
+        def restore(match):
+            if match.group(1) not in wanted:
+                return match.group(0)
+            restored.add(match.group(1))
+            return "\\" + match.group(1)
+
+        if wanted:
+            fixed_text = self._BROKEN_CMD_RE.sub(restore, fixed_text)
+        for cmd in self.BROKEN_COMMANDS:
+            if cmd in restored:
                 auto_fixed.append(f"Restored backslash for \\{cmd}")
 
-        # Recalculate after fixes
-        fixed_tokens = set(self._extract_math_tokens(fixed_text))
-        still_missing = orig_set - fixed_tokens
+        # Recalculate after fixes; re-extract only if a fix changed the text
+        if fixed_text == translated:
+            fixed_set = trans_set
+        else:
+            fixed_set = set(self._extract_math_tokens(fixed_text))
+        still_missing = orig_set - fixed_set
 
         # Score calculation
-        if len(orig_set) == 0:
-            score = 100
-        else:
-            preserved_ratio = 1.0 - (len(still_missing) / len(orig_set))
-            score = int(preserved_ratio * 100)
+        preserved_ratio = 1.0 - (len(still_missing) / len(orig_set))
+        score = int(preserved_ratio * 100)
 
-        for token in still_missing:
+        for token in sorted(still_missing):
             issues.append(f"Missing: {token[:60]}")
 
         # ── LLM assist for ambiguous cases (score 50-90) ──
         if 50 <= score <= 90 and "formula" in self.verify_types:
-            llm_result = self._llm_formula_check(original, fixed_text, list(still_missing)[:5])
+            llm_result = self._llm_formula_check(original, fixed_text, sorted(still_missing)[:5])
             if llm_result:
                 if llm_result.get("actually_preserved"):
                     # LLM says some "missing" formulas are actually equivalent forms
@@ -283,7 +549,8 @@ Translation (first 1500 chars):
 Respond in JSON only:
 {{"actually_preserved": <number of formulas that ARE present in equivalent form>, "genuinely_missing": <number truly missing>, "notes": "<brief explanation>"}}"""
 
-        result = self._call_ollama(prompt, temperature=0.1, max_tokens=512)
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=128,
+                                   stop=self._has_json_object)
         return self._parse_json_response(result)
 
     # ═══════════════════════════════════════════════════════════
@@ -307,11 +574,14 @@ Respond in JSON only:
         # Compare aligned paragraph pairs (up to 8 pairs for efficiency)
         num_pairs = min(len(orig_paras), len(trans_paras), 8)
 
-        for i in range(num_pairs):
-            orig_para = orig_paras[i][:800]
-            trans_para = trans_paras[min(i, len(trans_paras) - 1)][:800]
+        # All pairs are scored in one request, formulas masked
+        score_datas = self._llm_semantic_score_batch([
+            tuple(self._mask_math(orig_paras[i][:800],
+                                  trans_paras[min(i, len(trans_paras) - 1)][:800]))
+            for i in range(num_pairs)
+        ])
 
-            score_data = self._llm_semantic_score(orig_para, trans_para, i + 1)
+        for i, score_data in enumerate(score_datas):
             if score_data:
                 para_score = score_data.get("score", 7)
                 para_scores.append(para_score)
@@ -353,15 +623,39 @@ Respond in JSON only:
 
         return CheckResult(score=score, issues=issues, auto_fixed=auto_fixed)
 
+    def _mask_math(self, *texts: str) -> List[str]:
+        """texts with math regions longer than MASK_MIN_LEN replaced by
+        [MATH_n] placeholders, so LaTeX doesn't bloat LLM prompts. The same
+        formula gets the same placeholder in all of texts."""
+        ids = {}
+
+        def placeholder(match):
+            region = match.group(0)
+            if len(region) <= self.MASK_MIN_LEN:
+                return region
+            return f"[MATH_{ids.setdefault(region, len(ids))}]"
+
+        return [self._MATH_REGION_RE.sub(placeholder, text) for text in texts]
+
+    _WHITESPACE_RE = re.compile(r'\s+')
+
+    def _prompt_excerpt(self, text: str, max_chars: int) -> str:
+        """Opening of text for an enrichment prompt: math masked, whitespace
+        (PDF line breaks included) collapsed, and cut at the last sentence
+        end within max_chars, or at max_chars when no sentence ends in its
+        second half."""
+        text = self._mask_math(text[:max_chars * 2])[0]
+        text = self._WHITESPACE_RE.sub(' ', text).strip()
+        if len(text) <= max_chars:
+            return text
+        cut = text.rfind('. ', max_chars // 2, max_chars)
+        return text[:cut + 1] if cut != -1 else text[:max_chars]
+
     def _llm_semantic_score(self, orig_para: str, trans_para: str,
                              para_num: int) -> Optional[Dict]:
         """Score semantic equivalence of a paragraph pair."""
-        prompt = f"""Compare this English paragraph with its Korean translation.
-Rate semantic preservation on a scale of 1-10:
-- 10: Perfect meaning preservation
-- 7-9: Minor omissions/additions but core meaning intact
-- 4-6: Some meaning lost or distorted
-- 1-3: Severely distorted or mostly wrong
+        prompt = SEMANTIC_SCORE_INSTRUCTIONS + f"""Respond in JSON only:
+{{"score": <1-10>, "reason": "<brief reason in English, max 20 words>"}}
 
 English:
 {orig_para}
@@ -369,48 +663,101 @@ English:
 Korean translation:
 {trans_para}
 
-Respond in JSON only:
-{{"score": <1-10>, "reason": "<brief reason in English, max 20 words>"}}"""
+JSON:"""
 
-        result = self._call_ollama(prompt, temperature=0.1, max_tokens=256)
+        # The answer is one small JSON object
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=96,
+                                   stop=self._has_json_object)
         parsed = self._parse_json_response(result)
         if parsed and "score" in parsed:
             parsed["score"] = max(1, min(10, int(parsed["score"])))
         return parsed
 
+    def _llm_semantic_score_batch(self, pairs: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """Score several paragraph pairs with a single prompt. Pairs the
+        model leaves out or garbles are scored one by one instead."""
+        if len(pairs) <= 1:
+            return [self._llm_semantic_score(o, t, i) for i, (o, t) in enumerate(pairs, 1)]
+
+        blocks = "\n\n".join(
+            f"<pair {i}>\nEnglish:\n{orig}\n\nKorean translation:\n{trans}\n</pair {i}>"
+            for i, (orig, trans) in enumerate(pairs, 1)
+        )
+        prompt = SEMANTIC_SCORE_INSTRUCTIONS + f"""Rate each numbered paragraph pair below separately.
+Respond in JSON only, with one entry per pair:
+{{"scores": [{{"i": <pair number>, "score": <1-10>, "reason": "<brief reason in English, max 20 words>"}}, ...]}}
+
+{blocks}
+
+JSON:"""
+
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=96 * len(pairs),
+                                   stop=self._has_json_object)
+        entries = self._batch_entries(self._parse_json_response(result), "scores", len(pairs))
+        results = []
+        for entry in entries:
+            try:
+                entry["score"] = max(1, min(10, int(entry["score"])))
+            except (KeyError, TypeError, ValueError):
+                entry = None
+            results.append(entry)
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        fallback = self._map(lambda i: self._llm_semantic_score(*pairs[i], i + 1), missing)
+        for i, r in zip(missing, fallback):
+            results[i] = r
+        return results
+
+    @staticmethod
+    def _batch_entries(parsed: Optional[Dict], key: str, n: int) -> List[Optional[Dict]]:
+        """Entries of a batched response {key: [{"i": 1, ...}, ...]} by
+        1-based item number, None for items the response doesn't cover."""
+        by_index = {}
+        items = parsed.get(key) if isinstance(parsed, dict) else None
+        for entry in items if isinstance(items, list) else []:
+            try:
+                by_index.setdefault(int(entry["i"]), entry)
+            except (KeyError, TypeError, ValueError):
+                continue
+        return [by_index.get(i) for i in range(1, n + 1)]
+
     def _check_glossary_terms(self, original: str, translated: str) -> List[str]:
         """Check that standard math terms are correctly translated."""
         issues = []
-        orig_lower = original.lower()
 
-        for eng, kor in MATH_GLOSSARY.items():
-            if eng.lower() in orig_lower:
-                # Term exists in original; check Korean translation has the Korean term
-                if kor not in translated:
-                    # Could be a different valid translation - only flag major terms
-                    if len(eng) > 4:  # skip very short terms like "ring", "field"
-                        issues.append(f"Glossary: '{eng}' ({kor}) not found in translation")
+        for eng, kor in iter_glossary_terms(original, self._GLOSSARY_CHECKED):
+            # Term exists in original; check Korean translation has the Korean term
+            # (could be a different valid translation - only major terms are checked)
+            if kor not in translated:
+                issues.append(f"Glossary: '{eng}' ({kor}) not found in translation")
+                if len(issues) == 5:  # limit to 5 glossary issues
+                    break
 
-        return issues[:5]  # limit to 5 glossary issues
+        return issues
 
     # ═══════════════════════════════════════════════════════════
     # Module 3: Logic & Facts
     # ═══════════════════════════════════════════════════════════
 
     def _check_logic_facts(self, original: str, translated: str,
-                            title: str = "") -> CheckResult:
+                            title: str = "",
+                            claims: Optional[List[str]] = None) -> CheckResult:
         """Check preservation of logical claims and factual statements."""
         issues = []
         flagged = []
 
         # Extract verifiable claims via LLM
-        claims = self._extract_claims(original, title)
+        if claims is None:
+            claims = self._extract_claims(original, title)
         if not claims:
             return CheckResult(score=100)
 
-        # Verify each claim is preserved in translation
-        for claim in claims[:8]:  # max 8 claims
-            preservation = self._verify_claim_preserved(claim, translated)
+        # Verify each claim is preserved in translation (max 8 claims),
+        # all in one request. Claims whose names and numbers reappear
+        # verbatim in the translation are taken as preserved without asking.
+        checked_claims = [c for c in claims[:8] if not self._claim_anchored(c, translated)]
+        preservations = self._verify_claims_preserved_batch(checked_claims, translated)
+        for claim, preservation in zip(checked_claims, preservations):
             if preservation:
                 if not preservation.get("preserved", True):
                     reason = preservation.get("reason", "claim not found in translation")
@@ -433,59 +780,126 @@ Respond in JSON only:
 
     def _extract_claims(self, text: str, title: str = "") -> List[str]:
         """Extract verifiable factual claims from the text."""
-        prompt = f"""Extract verifiable factual claims from this math text.
-Focus on: theorem attributions, dates, numerical values, definitions, named results.
-
+        prompt = EXTRACT_CLAIMS_INSTRUCTIONS + f"""
 Title: {title}
 Text (first 2000 chars):
 {text[:2000]}
 
-List up to 6 claims, one per line. Each claim should be a single clear statement.
-Output ONLY the claims, one per line:"""
+Claims:"""
 
-        result = self._call_ollama(prompt, temperature=0.1, max_tokens=512)
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=256,
+                                   stop=self._has_enough_claims)
         if not result:
             return []
 
+        return self._claim_lines(result)[:6]
+
+    def _claim_lines(self, result: str) -> List[str]:
         claims = []
         for line in result.strip().split('\n'):
             line = line.strip()
             # Remove numbering
-            line = re.sub(r'^\d+[\.\)]\s*', '', line)
-            line = re.sub(r'^[-*]\s*', '', line)
+            line = self._LIST_MARKER_RE.sub('', line)
             if line and len(line) > 15:
                 claims.append(line)
+        return claims
 
-        return claims[:6]
+    def _has_enough_claims(self, partial: str) -> bool:
+        """Stream stop for _extract_claims: 6 complete claim lines."""
+        return len(self._claim_lines(partial.rpartition('\n')[0])) >= 6
+
+    def _claim_anchored(self, claim: str, translated: str) -> bool:
+        """True if at least 80% of the claim's proper nouns and numbers
+        (and at least two of them) appear verbatim in the translation."""
+        anchors = self._claim_anchors(claim)
+        if len(anchors) < 2:
+            return False
+        hits = sum(1 for t in anchors if t in translated)
+        return hits >= 0.8 * len(anchors)
+
+    def _claim_anchors(self, claim: str) -> List[str]:
+        """Proper nouns and numbers of a claim, most specific first."""
+        return [t for t in self._extract_search_terms(claim)
+                if t[0].isupper() or any(ch.isdigit() for ch in t)]
+
+    def _relevant_window(self, text: str, keywords: List[str],
+                         radius: int = 400) -> Optional[str]:
+        """text within radius chars of the first keyword found (in keyword
+        order), or None if none of them occurs."""
+        for keyword in keywords:
+            pos = text.find(keyword)
+            if pos != -1:
+                return text[max(0, pos - radius):pos + len(keyword) + radius]
+        return None
 
     def _verify_claim_preserved(self, claim: str, translated: str) -> Optional[Dict]:
         """Verify that a specific claim is preserved in the translation."""
-        prompt = f"""Is this factual claim preserved in the Korean translation below?
+        # Only the part of the translation around the claim's names/numbers
+        # is sent when they can be found; otherwise its first 2000 chars
+        window = self._relevant_window(translated, self._claim_anchors(claim))
+        if window is not None:
+            window, claim = self._mask_math(window, claim)
+            excerpt = f"Korean translation (excerpt):\n{window}"
+        else:
+            excerpt, claim = self._mask_math(translated[:2000], claim)
+            excerpt = f"Korean translation (first 2000 chars):\n{excerpt}"
+        prompt = CLAIM_PRESERVED_INSTRUCTIONS + f"""Respond in JSON:
+{{"preserved": true/false, "reason": "<brief reason>"}}
+
+{excerpt}
 
 Claim: {claim}
 
+JSON:"""
+
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=128,
+                                   stop=self._has_json_object)
+        return self._parse_json_response(result)
+
+    def _verify_claims_preserved_batch(self, claims: List[str],
+                                       translated: str) -> List[Optional[Dict]]:
+        """Check several claims against the translation with a single prompt.
+        Claims the model leaves out are checked one by one instead."""
+        if len(claims) <= 1:
+            return [self._verify_claim_preserved(c, translated) for c in claims]
+
+        excerpt, *masked = self._mask_math(translated[:2000], *claims)
+        numbered = "\n".join(f"{i}. {claim}" for i, claim in enumerate(masked, 1))
+        prompt = CLAIM_PRESERVED_INSTRUCTIONS + f"""Check each numbered claim separately.
+Respond in JSON, with one entry per claim:
+{{"claims": [{{"i": <claim number>, "preserved": true/false, "reason": "<brief reason>"}}, ...]}}
+
 Korean translation (first 2000 chars):
-{translated[:2000]}
+{excerpt}
 
-Respond in JSON:
-{{"preserved": true/false, "reason": "<brief reason>"}}"""
+Claims:
+{numbered}
 
-        result = self._call_ollama(prompt, temperature=0.1, max_tokens=256)
-        return self._parse_json_response(result)
+JSON:"""
+
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=96 * len(claims),
+                                   stop=self._has_json_object)
+        results = [e if e is not None and "preserved" in e else None
+                   for e in self._batch_entries(self._parse_json_response(result),
+                                                "claims", len(claims))]
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        fallback = self._map(lambda i: self._verify_claim_preserved(claims[i], translated),
+                             missing)
+        for i, r in zip(missing, fallback):
+            results[i] = r
+        return results
 
     def _check_internal_logic(self, translated: str) -> List[str]:
         """Check for internal logic issues in the translated text."""
-        prompt = f"""Analyze this Korean math translation for internal logic issues.
-Look for: contradictions, variable inconsistencies, broken definitions.
-
+        prompt = INTERNAL_LOGIC_INSTRUCTIONS + f"""
 Text (first 2000 chars):
 {translated[:2000]}
 
-If no issues found, respond: {{"issues": []}}
-If issues found, respond: {{"issues": ["issue1", "issue2"]}}
-Respond in JSON only:"""
+JSON:"""
 
-        result = self._call_ollama(prompt, temperature=0.1, max_tokens=512)
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=256,
+                                   stop=self._has_json_object)
         parsed = self._parse_json_response(result)
         if parsed and "issues" in parsed:
             return [str(i) for i in parsed["issues"][:3]]
@@ -496,21 +910,24 @@ Respond in JSON only:"""
     # ═══════════════════════════════════════════════════════════
 
     def _check_deep_research(self, original: str, translated: str,
-                              title: str = "") -> CheckResult:
+                              title: str = "",
+                              claims: Optional[List[str]] = None) -> CheckResult:
         """Cross-reference claims against external sources."""
         issues = []
         flagged = []
 
         # Extract key claims to verify externally
-        claims = self._extract_claims(original, title)
+        if claims is None:
+            claims = self._extract_claims(original, title)
         if not claims:
             return CheckResult(score=100)
 
         verified = 0
         checked = 0
 
-        for claim in claims[:5]:  # max 5 for rate limiting
-            result = self._wikipedia_verify(claim)
+        claims = claims[:5]  # max 5 for rate limiting
+        results = self._map(self._wikipedia_verify, claims, workers=self.WIKI_PARALLEL)
+        for claim, result in zip(claims, results):
             if result is not None:
                 checked += 1
                 if result["supported"]:
@@ -519,7 +936,6 @@ Respond in JSON only:"""
                     flagged.append(
                         f"Unverified: {claim[:80]} → {result.get('note', 'no Wikipedia match')}"
                     )
-            time.sleep(1)  # rate limiting
 
         if checked == 0:
             return CheckResult(score=80, issues=["No claims could be verified externally"])
@@ -539,73 +955,64 @@ Respond in JSON only:"""
         query = " ".join(search_terms[:4])
 
         try:
-            # Step 1: Search Wikipedia
-            search_url = "https://en.wikipedia.org/w/api.php"
-            headers = {"User-Agent": "PCMTranslationVerifier/1.0 (educational project)"}
-            params = {
-                "action": "query",
-                "list": "search",
-                "srsearch": query,
-                "srlimit": 3,
-                "format": "json",
-                "utf8": 1,
-            }
-            resp = requests.get(search_url, params=params, headers=headers, timeout=10)
-            resp.raise_for_status()
-            search_results = resp.json().get("query", {}).get("search", [])
-
-            if not search_results:
+            # Top search result and its extract
+            page = self._wiki_search_extract(query, sentences=5)
+            if page is None:
                 return {"supported": False, "note": "no Wikipedia results"}
 
-            # Step 2: Get extract from top result
-            page_title = search_results[0]["title"]
-            extract_params = {
-                "action": "query",
-                "titles": page_title,
-                "prop": "extracts",
-                "exintro": True,
-                "explaintext": True,
-                "exsentences": 5,
-                "format": "json",
-                "utf8": 1,
-            }
-            resp2 = requests.get(search_url, params=extract_params, headers=headers, timeout=10)
-            resp2.raise_for_status()
-            pages = resp2.json().get("query", {}).get("pages", {})
-
-            extract = ""
-            for page in pages.values():
-                extract = page.get("extract", "")
-                break
-
+            page_title, extract = page["title"], page["extract"]
             if not extract:
                 return {"supported": False, "note": f"empty extract from '{page_title}'"}
 
-            # Step 3: Use LLM to compare claim with Wikipedia extract
+            # Use LLM to compare claim with Wikipedia extract
             supported = self._llm_fact_check(claim, extract, page_title)
             return supported
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             return None
 
+    def _wiki_query(self, params: Dict) -> Dict:
+        """GET the MediaWiki API. Responses are cached per parameter set
+        (search query, page title) in memory and, with cache_path, on disk
+        for WIKI_CACHE_MAX_AGE; only requests that reach Wikipedia are
+        rate-limited. Responses are decoded with jsonio (orjson when
+        installed).
+        Raises requests.exceptions.RequestException on network errors and
+        ValueError on a malformed response.
+        """
+        key_params = dict(params)
+        if "gsrsearch" in key_params:
+            # Search is case-insensitive, so "Group theory" and
+            # "group  theory" share an entry
+            key_params["gsrsearch"] = " ".join(key_params["gsrsearch"].lower().split())
+        key = hash_key(*(f"{k}={v}" for k, v in sorted(key_params.items())))
+        result = self._wiki_memo.get(key)
+        if result is not None:
+            return result
+
+        def fetch() -> Dict:
+            data = (self._wiki_cache.get(key, max_age=self.WIKI_CACHE_MAX_AGE)
+                    if self._wiki_cache is not None else None)
+            if data is not None:
+                result = jsonio.loads(data)
+            else:
+                self._wiki_limiter.acquire()
+                resp = self.session.get(self.WIKI_API_URL, params=params,
+                                        headers=self.WIKI_HEADERS, timeout=10)
+                resp.raise_for_status()
+                result = jsonio.loads(resp.content)
+                if self._wiki_cache is not None:
+                    self._wiki_cache.put(key, resp.content)
+            # Callers only read the parsed response, so it is shared
+            return self._remember(self._wiki_memo, key, result)
+
+        return self._shared_call(("wiki", key), fetch)
+
     def _extract_search_terms(self, claim: str) -> List[str]:
         """Extract searchable terms from a claim."""
         # Remove common words, keep nouns and proper nouns
-        words = claim.split()
-        stopwords = {
-            'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-            'has', 'have', 'had', 'do', 'does', 'did', 'will', 'would',
-            'could', 'should', 'may', 'might', 'can', 'shall', 'that',
-            'this', 'these', 'those', 'it', 'its', 'of', 'in', 'on',
-            'at', 'to', 'for', 'with', 'by', 'from', 'as', 'or', 'and',
-            'not', 'no', 'but', 'if', 'then', 'than', 'so', 'very',
-        }
-
-        terms = []
-        for word in words:
-            clean = re.sub(r'[^a-zA-Z0-9\-]', '', word)
-            if clean and clean.lower() not in stopwords and len(clean) > 2:
-                terms.append(clean)
+        words = self._NON_TERM_RE.sub('', claim).split()
+        terms = [w for w in words if len(w) > 2 and w.lower() not in self._STOPWORDS]
 
         # Prioritize capitalized words (likely proper nouns)
         terms.sort(key=lambda w: (0 if w[0].isupper() else 1, -len(w)))
@@ -614,17 +1021,16 @@ Respond in JSON only:"""
     def _llm_fact_check(self, claim: str, wiki_extract: str,
                          wiki_title: str) -> Dict:
         """Use LLM to check if Wikipedia extract supports the claim."""
-        prompt = f"""Does this Wikipedia extract support or contradict the claim?
-
-Claim: {claim}
-
+        prompt = FACT_CHECK_INSTRUCTIONS + f"""
 Wikipedia article: {wiki_title}
 Extract: {wiki_extract[:1000]}
 
-Respond in JSON:
-{{"supported": true/false, "note": "<brief explanation>"}}"""
+Claim: {claim}
+
+JSON:"""
 
-        result = self._call_ollama(prompt, temperature=0.1, max_tokens=256)
+        result = self._call_ollama(prompt, temperature=0.1, max_tokens=128,
+                                   stop=self._has_json_object)
         parsed = self._parse_json_response(result)
         if parsed and "supported" in parsed:
             return parsed
@@ -634,10 +1040,19 @@ Respond in JSON:
     # Main orchestrator
     # ═══════════════════════════════════════════════════════════
 
+    def _cache_key(self, *parts: str) -> str:
+        """Content hash identifying one verify/enrich run's inputs."""
+        return hash_key(*parts)
+
+    def _verify_cache_key(self, original: str, translated: str, title: str) -> str:
+        return self._cache_key(SCORING_VERSION, original, translated, title, self.model_name,
+                               self.research_model, ",".join(self.verify_types))
+
     def verify_section(self, section_data: Dict) -> Dict:
         """Run all enabled verification modules on a section.
         Returns verification report dict and may modify section_data in-place
-        (auto-fixing content_translated).
+        (auto-fixing content_translated). A previous report is reused when the
+        section, models and verify types are unchanged since it was made.
         """
         original = section_data.get("content_original", "")
         translated = section_data.get("content_translated", "")
@@ -646,45 +1061,57 @@ Respond in JSON:
         if not original or not translated:
             return {"score": 100, "skipped": True}
 
-        report = {}
-
-        # Module 1: Formula integrity
-        if "formula" in self.verify_types:
-            print(f"    [1/4] Checking formula integrity...")
-            formula_result, fixed_text = self._check_formula_integrity(original, translated)
-            report["formula"] = formula_result.to_dict()
-            if fixed_text != translated:
-                section_data["content_translated"] = fixed_text
-                translated = fixed_text  # use fixed text for subsequent checks
-            time.sleep(0.3)
-        else:
-            report["formula"] = {"score": 100, "issues": [], "skipped": True}
-
-        # Module 2: Semantic equivalence
-        if "semantic" in self.verify_types:
-            print(f"    [2/4] Checking semantic equivalence...")
-            semantic_result = self._check_semantic_equivalence(original, translated, title)
-            report["semantic"] = semantic_result.to_dict()
-            time.sleep(0.3)
-        else:
-            report["semantic"] = {"score": 100, "issues": [], "skipped": True}
-
-        # Module 3: Logic & facts
-        if "logic" in self.verify_types:
-            print(f"    [3/4] Checking logic and facts...")
-            logic_result = self._check_logic_facts(original, translated, title)
-            report["logic"] = logic_result.to_dict()
-            time.sleep(0.3)
-        else:
-            report["logic"] = {"score": 100, "issues": [], "skipped": True}
+        previous = section_data.get("verification") or {}
+        if previous.get("_cache_key") == self._verify_cache_key(original, translated, title):
+            print(f"    Unchanged since last verification, reusing report")
+            return previous
 
-        # Module 4: Deep research
-        if "research" in self.verify_types:
-            print(f"    [4/4] Cross-referencing with external sources...")
-            research_result = self._check_deep_research(original, translated, title)
-            report["research"] = research_result.to_dict()
-        else:
-            report["research"] = {"score": 100, "issues": [], "skipped": True}
+        report = {}
+        modules = [
+            ("semantic", "[2/4] Checking semantic equivalence...",
+             self._check_semantic_equivalence),
+            ("logic", "[3/4] Checking logic and facts...",
+             self._check_logic_facts),
+            ("research", "[4/4] Cross-referencing with external sources...",
+             self._check_deep_research),
+        ]
+        enabled = [m for m in modules if m[0] in self.verify_types]
+
+        with ThreadPoolExecutor(max_workers=len(enabled) + 1) as ex:
+            # Claims depend only on the original, so Modules 3 and 4 share one
+            # extraction, started before Module 1 so it overlaps with it
+            claims = None
+            if any(name in ("logic", "research") for name, _, _ in enabled):
+                claims = ex.submit(self._extract_claims, original, title)
+
+            # Module 1: Formula integrity — runs first since it may auto-fix the
+            # translation that the remaining modules check
+            if "formula" in self.verify_types:
+                print(f"    [1/4] Checking formula integrity...")
+                formula_result, fixed_text = self._check_formula_integrity(original, translated)
+                report["formula"] = formula_result.to_dict()
+                if fixed_text != translated:
+                    section_data["content_translated"] = fixed_text
+                    translated = fixed_text  # use fixed text for subsequent checks
+            else:
+                report["formula"] = {"score": 100, "issues": [], "skipped": True}
+
+            # Modules 2-4 are independent of each other, so their LLM/wiki calls
+            # are submitted together rather than one after another
+            futures = {}
+            for name, label, check in enabled:
+                print(f"    {label}")
+                if name == "semantic":
+                    futures[name] = ex.submit(check, original, translated, title)
+                else:
+                    futures[name] = ex.submit(
+                        lambda check=check, text=translated: check(
+                            original, text, title, claims=claims.result()))
+            for name, fut in futures.items():
+                report[name] = fut.result().to_dict()
+        for name, _, _ in modules:
+            if name not in report:
+                report[name] = {"score": 100, "issues": [], "skipped": True}
 
         # Calculate weighted overall score
         total_score = 0
@@ -699,8 +1126,20 @@ Respond in JSON:
         else:
             report["score"] = 100
 
+        # Keyed on the post-fix text, which is what gets saved
+        report["_cache_key"] = self._verify_cache_key(original, translated, title)
         return report
 
+    def verify_sections(self, sections: Dict[str, Dict],
+                        max_workers: Optional[int] = None) -> Iterator[Tuple[str, Dict]]:
+        """Verify several sections concurrently.
+        Yields (section_id, report) in completion order; each section is an
+        independent chain of Ollama calls, so up to max_workers run at once.
+        """
+        for sid, result in bounded_map(lambda sid: self.verify_section(sections[sid]),
+                                       sections, max_workers or DEFAULT_PARALLEL):
+            yield sid, result
+
     # ═══════════════════════════════════════════════════════════
     # Deep Research Enrichment (educational content generation)
     # ═══════════════════════════════════════════════════════════
@@ -713,6 +1152,8 @@ Respond in JSON:
           - explanation: Korean explanation (2-4 sentences)
           - context: why it matters in this section
           - source: Wikipedia article title
+        Records a content hash in section_data["_enrich_cache_key"]; while it
+        matches, the section's stored enrichments are returned as-is.
         """
         original = section_data.get("content_original", "")
         title = section_data.get("title_original", "")
@@ -720,21 +1161,81 @@ Respond in JSON:
         if not original or len(original) < 100:
             return []
 
+        key = self._cache_key(original, title, self.model_name, self.research_model)
+        if section_data.get("_enrich_cache_key") == key:
+            return section_data.get("enrichments", [])
+
         # Step 1: Extract key concepts that need explanation
         concepts = self._extract_key_concepts(original, title)
         if not concepts:
             return []
 
-        enrichments = []
-        for concept in concepts[:6]:  # max 6 per section
-            print(f"      Researching: {concept}...")
-            entry = self._research_concept(concept, original)
-            if entry:
-                enrichments.append(entry)
-            time.sleep(1)  # rate limiting
-
+        concepts = concepts[:6]  # max 6 per section
+        # Concepts explained for an earlier section reuse that note
+        notes = {c: self._concept_notes.get(c.lower()) for c in concepts}
+        todo = [c for c in concepts if notes[c] is None]
+
+        if todo:
+            for concept in todo:
+                print(f"      Researching: {concept}...")
+            # Concepts are looked up concurrently. Notes are written
+            # CONCEPT_BATCH concepts per request, and each request starts
+            # once its concepts' lookups are done, while later lookups are
+            # still in flight. Batches hold the found concepts in order, so
+            # the same concepts always make up the same prompts.
+            batches = []
+            with ThreadPoolExecutor(max_workers=min(self.WIKI_PARALLEL, len(todo))) as lookups, \
+                    ThreadPoolExecutor(max_workers=-(-len(todo) // self.CONCEPT_BATCH)) as writers:
+                infos = [lookups.submit(self._lookup_concept, c) for c in todo]
+                chunk = {}
+                for i, (concept, info) in enumerate(zip(todo, infos)):
+                    if info.result():
+                        chunk[concept] = info.result()
+                    if len(chunk) == self.CONCEPT_BATCH or (chunk and i == len(todo) - 1):
+                        batches.append(writers.submit(
+                            self._research_concepts_batch, list(chunk), original, chunk))
+                        chunk = {}
+            for batch in batches:
+                for entry in batch.result():
+                    if entry:
+                        notes[entry["term"]] = self._remember(
+                            self._concept_notes, entry["term"].lower(), entry)
+
+        enrichments = [{**notes[c], "term": c} for c in concepts if notes[c]]
+
+        section_data["_enrich_cache_key"] = key
         return enrichments
 
+    def enrich_sections(self, sections: Dict[str, Dict],
+                        max_workers: Optional[int] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """Enrich several sections concurrently.
+        Yields (section_id, enrichments) in completion order.
+        """
+        for sid, result in bounded_map(lambda sid: self.enrich_section(sections[sid]),
+                                       sections, max_workers or DEFAULT_PARALLEL):
+            yield sid, result
+
+    # Terms the concept prompt asks the model to leave out but that it still
+    # returns at times; they are dropped before any Wikipedia or LLM work
+    _BASIC_CONCEPTS = frozenset({
+        'number', 'integer', 'real number', 'natural number', 'rational number',
+        'fraction', 'decimal', 'digit', 'sum', 'product', 'difference', 'quotient',
+        'addition', 'subtraction', 'multiplication', 'division', 'square', 'cube',
+        'square root', 'power', 'exponent', 'equation', 'formula', 'expression',
+        'variable', 'constant', 'function', 'set', 'element', 'proof', 'theorem',
+        'lemma', 'definition', 'example', 'problem', 'solution', 'answer',
+        'mathematics', 'mathematician', 'math', 'calculation', 'computation',
+        'point', 'line', 'plane', 'circle', 'triangle', 'angle', 'shape',
+        'graph', 'table', 'list', 'sequence', 'pattern', 'rule', 'result',
+    })
+
+    def _is_basic_concept(self, concept: str) -> bool:
+        key = concept.strip().lower()
+        if key.startswith(('the ', 'a ', 'an ')):
+            key = key.split(' ', 1)[1]
+        return key in self._BASIC_CONCEPTS or (
+            key.endswith('s') and key[:-1] in self._BASIC_CONCEPTS)
+
     def _extract_key_concepts(self, text: str, title: str = "") -> List[str]:
         """Extract key mathematical concepts, people, and theorems that would
         benefit from additional explanation for a general reader."""
@@ -752,35 +1253,45 @@ Do NOT include:
 - Terms that are self-explanatory from context
 
 Section title: {title}
-Text (first 2500 chars):
-{text[:2500]}
+Text (opening of the section):
+{self._prompt_excerpt(text, 2000)}
 
 List the most important 4-8 concepts, one per line.
 Output ONLY the concept names, nothing else:"""
 
-        result = self._call_ollama(prompt, temperature=0.2, max_tokens=512)
+        result = self._call_ollama(prompt, temperature=0.2, max_tokens=128,
+                                   stop=self._has_enough_concepts)
         if not result:
             return []
 
+        return self._concept_lines(result)[:8]
+
+    def _concept_lines(self, result: str) -> List[str]:
         concepts = []
+        seen = set()
         for line in result.strip().split('\n'):
             line = line.strip()
-            line = re.sub(r'^\d+[\.\)]\s*', '', line)
-            line = re.sub(r'^[-*]\s*', '', line)
+            line = self._LIST_MARKER_RE.sub('', line)
             line = line.strip('"\'')
-            if line and len(line) > 2 and len(line) < 80:
+            # A concept listed twice (in any case) is kept once
+            if (line and len(line) > 2 and len(line) < 80
+                    and line.lower() not in seen and not self._is_basic_concept(line)):
+                seen.add(line.lower())
                 concepts.append(line)
+        return concepts
 
-        return concepts[:8]
+    def _has_enough_concepts(self, partial: str) -> bool:
+        """Stream stop for _extract_key_concepts: 8 complete concept lines."""
+        return len(self._concept_lines(partial.rpartition('\n')[0])) >= 8
 
-    def _research_concept(self, concept: str, section_text: str) -> Optional[Dict]:
-        """Research a concept via Wikipedia and generate an educational explanation."""
-        # Step 1: Get Wikipedia info
-        wiki_info = self._fetch_wikipedia_summary(concept)
-        if not wiki_info:
-            # Try with broader search
-            wiki_info = self._fetch_wikipedia_summary(concept + " mathematics")
+    def _has_first_line(self, partial: str) -> bool:
+        """Stream stop for one-line answers: a complete non-empty line."""
+        return '\n' in partial.lstrip()
 
+    def _research_concept(self, concept: str, section_text: str,
+                          wiki_info: Optional[Dict]) -> Optional[Dict]:
+        """Generate an educational explanation of a concept from its Wikipedia
+        summary (from _lookup_concept; None if there is none)."""
         if not wiki_info:
             return None
 
@@ -793,10 +1304,10 @@ Write a clear, accessible explanation of "{concept}" based on the Wikipedia info
 
 Wikipedia article: {wiki_title}
 Wikipedia extract:
-{wiki_extract[:1500]}
+{self._prompt_excerpt(wiki_extract, 800)}
 
 Section context (where this concept appears):
-{section_text[:500]}
+{self._prompt_excerpt(section_text, 500)}
 
 Write in Korean. Your explanation should include:
 1. 이 개념이 무엇인지 (1-2문장, 쉬운 말로)
@@ -817,10 +1328,19 @@ Write in Korean. Your explanation should include:
             return None
 
         # Clean the explanation
-        explanation = re.sub(r'(Here is|Below is|다음은|아래는).*?\n', '', explanation)
+        explanation = self._INTRO_RE.sub('', explanation)
         explanation = explanation.strip()
 
-        # Step 3: Generate Korean title
+        # Step 3: Korean title, from the glossary when the concept is in it
+        title_ko = self._glossary_title(concept)
+        if title_ko:
+            return {
+                "term": concept,
+                "title_ko": title_ko,
+                "explanation": explanation,
+                "source": wiki_title,
+            }
+
         title_prompt = f"""Translate this mathematical concept name to Korean (with original in parentheses).
 Format: "Korean Name (Original Name)"
 If it's a person's name, use Korean transliteration.
@@ -829,7 +1349,8 @@ Concept: {concept}
 
 Korean title (one line only):"""
 
-        title_ko = self._call_ollama(title_prompt, temperature=0.1, max_tokens=64)
+        title_ko = self._call_ollama(title_prompt, temperature=0.1, max_tokens=32,
+                                     stop=self._has_first_line)
         title_ko = title_ko.strip().split('\n')[0].strip('"\'')
         if not title_ko or len(title_ko) < 2:
             title_ko = concept
@@ -841,60 +1362,138 @@ Korean title (one line only):"""
             "source": wiki_title,
         }
 
+    def _glossary_title(self, concept: str) -> Optional[str]:
+        """"Korean (English)" title for a concept that is a glossary term
+        (singular or plural), so the glossary's translation is used
+        without asking the model."""
+        key = concept.strip().lower()
+        kor = self._GLOSSARY_TITLES.get(key)
+        if kor is None and key.endswith('s'):
+            kor = self._GLOSSARY_TITLES.get(key[:-1])
+        return f"{kor} ({concept.strip()})" if kor else None
+
+    # Concepts whose notes are requested together; their extracts are
+    # shortened so the prompt still fits a small context window
+    CONCEPT_BATCH = 3
+
+    def _research_concepts_batch(self, concepts: List[str], section_text: str,
+                                 wiki_infos: Dict[str, Dict]) -> List[Optional[Dict]]:
+        """_research_concept for several concepts with a single prompt that
+        asks for each explanation and Korean title. Concepts the model
+        leaves out or answers badly are researched one by one instead."""
+        if len(concepts) <= 1:
+            return [self._research_concept(c, section_text, wiki_infos[c]) for c in concepts]
+
+        blocks = "\n\n".join(
+            f"<concept {i}>\nConcept: {c}\nWikipedia article: {wiki_infos[c]['title']}\n"
+            f"Wikipedia extract:\n{self._prompt_excerpt(wiki_infos[c]['extract'], 800)}\n"
+            f"</concept {i}>"
+            for i, c in enumerate(concepts, 1)
+        )
+        prompt = f"""You are creating educational notes for a Korean reader studying mathematics.
+For each numbered concept below, write a clear, accessible explanation based on its Wikipedia information.
+
+Write each explanation in Korean. It should include:
+1. 이 개념이 무엇인지 (1-2문장, 쉬운 말로)
+2. 왜 중요한지 / 어디에 쓰이는지 (1문장)
+3. 이 섹션과의 관련성 (1문장)
+
+규칙:
+- 한국어로만 작성
+- 수학 기호는 LaTeX 형식 유지 ($...$)
+- 총 3-5문장, 간결하게
+- 비유나 직관적 설명 포함
+
+Also give each concept a Korean title in the format "Korean Name (Original Name)";
+use Korean transliteration for a person's name.
+
+Respond in JSON only, with one entry per concept (escape backslashes as \\\\):
+{{"notes": [{{"i": <concept number>, "title_ko": "<Korean title>", "explanation": "<explanation>"}}, ...]}}
+
+Section context (where these concepts appear):
+{self._prompt_excerpt(section_text, 500)}
+
+{blocks}
+
+JSON:"""
+
+        result = self._call_ollama(prompt, temperature=0.3, max_tokens=384 * len(concepts),
+                                   stop=self._has_json_object)
+        entries = self._batch_entries(self._parse_json_response(result), "notes", len(concepts))
+
+        results = []
+        for concept, entry in zip(concepts, entries):
+            explanation = entry.get("explanation") if entry else None
+            if not isinstance(explanation, str) or len(explanation) < 30:
+                results.append(None)
+                continue
+            title_ko = (self._glossary_title(concept)
+                        or str(entry.get("title_ko") or "").strip().split('\n')[0].strip('"\''))
+            results.append({
+                "term": concept,
+                "title_ko": title_ko if len(title_ko) >= 2 else concept,
+                "explanation": self._INTRO_RE.sub('', explanation).strip(),
+                "source": wiki_infos[concept]["title"],
+            })
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        fallback = self._map(
+            lambda i: self._research_concept(concepts[i], section_text, wiki_infos[concepts[i]]),
+            missing)
+        for i, r in zip(missing, fallback):
+            results[i] = r
+        return results
+
     def _fetch_wikipedia_summary(self, query: str) -> Optional[Dict]:
         """Fetch Wikipedia summary for a concept."""
         try:
-            search_url = "https://en.wikipedia.org/w/api.php"
-            headers = {"User-Agent": "PCMTranslationVerifier/1.0 (educational project)"}
-
-            # Search
-            params = {
-                "action": "query",
-                "list": "search",
-                "srsearch": query,
-                "srlimit": 3,
-                "format": "json",
-                "utf8": 1,
-            }
-            resp = requests.get(search_url, params=params, headers=headers, timeout=10)
-            resp.raise_for_status()
-            results = resp.json().get("query", {}).get("search", [])
-
-            if not results:
-                return None
-
-            # Get extract from best result
-            page_title = results[0]["title"]
-            extract_params = {
-                "action": "query",
-                "titles": page_title,
-                "prop": "extracts",
-                "exintro": True,
-                "explaintext": True,
-                "exsentences": 8,
-                "format": "json",
-                "utf8": 1,
-            }
-            resp2 = requests.get(search_url, params=extract_params, headers=headers, timeout=10)
-            resp2.raise_for_status()
-            pages = resp2.json().get("query", {}).get("pages", {})
-
-            for page in pages.values():
-                extract = page.get("extract", "")
-                if extract and len(extract) > 50:
-                    return {"title": page_title, "extract": extract}
-
-            return None
-        except requests.exceptions.RequestException:
+            page = self._wiki_search_extract(query, sentences=8)
+        except (requests.exceptions.RequestException, ValueError):
             return None
+        if page and len(page["extract"]) > 50:
+            return page
+        return None
+
+    def _lookup_concept(self, concept: str) -> Optional[Dict]:
+        """Wikipedia summary for a concept, from a broader search when its
+        name alone finds nothing."""
+        return (self._fetch_wikipedia_summary(concept)
+                or self._fetch_wikipedia_summary(concept + " mathematics"))
+
+    def _wiki_search_extract(self, query: str, sentences: int) -> Optional[Dict]:
+        """Intro extract of the top search result for query as {"title",
+        "extract"}, or None if nothing matches. The search runs as a
+        generator, so the page and its extract come back in one request.
+        Raises what _wiki_query raises.
+        """
+        params = {
+            "action": "query",
+            "generator": "search",
+            "gsrsearch": query,
+            "gsrlimit": 1,
+            "prop": "extracts",
+            "exintro": True,
+            "explaintext": True,
+            "exsentences": sentences,
+            "format": "json",
+            "utf8": 1,
+        }
+        pages = self._wiki_query(params).get("query", {}).get("pages", {})
+        for page in pages.values():
+            return {"title": page.get("title", ""), "extract": page.get("extract", "")}
+        return None
+
+    def close(self):
+        """Release pooled HTTP connections and the response cache."""
+        self.session.close()
+        for cache in (self._llm_cache, self._wiki_cache):
+            if cache is not None:
+                cache.close()
 
     def test_connection(self) -> bool:
         """Test if the verification model is available."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            response.raise_for_status()
-            models = response.json().get("models", [])
-            model_names = [m["name"] for m in models]
+            model_names = ollama_models(self.session, self.base_url)
 
             if self.model_name in model_names:
                 print(f"Verify model '{self.model_name}' is available")
@@ -907,6 +1506,16 @@ Korean title (one line only):"""
             print(f"Cannot connect to Ollama: {e}")
             return False
 
+    def warmup(self):
+        """Load the verify model with an empty prompt and keep it loaded."""
+        try:
+            post_json(self.session, self.api_url,
+                      {"model": self.model_name, "prompt": "", "stream": False,
+                       "keep_alive": OLLAMA_KEEP_ALIVE, "options": {"num_ctx": self.NUM_CTX}},
+                      timeout=300)
+        except requests.exceptions.RequestException:
+            pass  # the first real request loads the model instead
+
 
 def main():
     """Test the verifier with sample data."""
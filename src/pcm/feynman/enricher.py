@@ -8,6 +8,8 @@ class FeynmanEnricher:
     def __init__(self, model_name: str = "qwen2.5-coder:7b", base_url: str = "http://localhost:11434"):
         self.model_name = model_name
         self.base_url = f"{base_url}/api/generate"
+        # Keep-alive connection reused for every paragraph
+        self.session = requests.Session()
 
     def clean_filler(self, text: str) -> str:
         """Remove LLM conversational filler."""
@@ -81,7 +83,7 @@ Output ONLY a JSON object:
         }
 
         try:
-            r = requests.post(self.base_url, json=payload, timeout=60)
+            r = self.session.post(self.base_url, json=payload, timeout=60)
             res = r.json().get("response", "{}")
             enrichment = json.loads(res)
             
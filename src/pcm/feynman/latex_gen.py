@@ -2,6 +2,20 @@ import json
 import os
 import re
 
+IMG_ROOT = "feynman_json"
+IMG_DIR = f"{IMG_ROOT}/images"
+# Vector sources (.svg/.svgz) are converted to a sibling .pdf by batch_img
+_EXT_RE = re.compile(r"\.svgz?$")
+# Formats \includegraphics can embed directly under XeLaTeX
+_RASTER_EXTS = frozenset({"pdf", "jpg", "png"})
+
+# Math-safe escaping: $...$ / $$...$$ regions are copied through untouched
+_MATH_RE = re.compile(r'\$\$.*?\$\$|\$.*?\$', re.DOTALL)
+_LATEX_ESCAPE_TABLE = str.maketrans({"&": "\\&", "%": "\\%", "#": "\\#"})
+_USCORE_RE = re.compile(r'(?<![\\])_')
+# The only characters _escape_latex ever touches; text without them passes through
+_NEEDS_ESCAPE_RE = re.compile(r'[$&%#_]')
+
 class FeynmanLatexGen:
     def __init__(self, template_path=None):
         self.preamble = self._get_default_preamble()
@@ -193,21 +207,37 @@ class FeynmanLatexGen:
         return line.strip()
 
     def _escape_latex(self, text):
-        if not text: return ""
+        if not text or not _NEEDS_ESCAPE_RE.search(text): return text or ""
         # Math-safe LaTeX escaping: protect $...$ and $$...$$ regions
-        import re
-        parts = re.split(r'(\$\$.*?\$\$|\$.*?\$)', text, flags=re.DOTALL)
-        result = []
-        for i, part in enumerate(parts):
-            if i % 2 == 1:
-                # Inside math — don't escape
-                result.append(part)
-            else:
+        out = []
+        last = 0
+        for m in _MATH_RE.finditer(text):
+            s, e = m.span()
+            if s > last:
                 # Outside math — escape special chars
-                part = part.replace("&", "\\&").replace("%", "\\%").replace("#", "\\#")
-                part = re.sub(r'(?<![\\])_', r'\\_', part)
-                result.append(part)
-        return "".join(result)
+                out.append(_USCORE_RE.sub(r'\\_', text[last:s].translate(_LATEX_ESCAPE_TABLE)))
+            # Inside math — don't escape
+            out.append(text[s:e])
+            last = e
+        if last < len(text):
+            out.append(_USCORE_RE.sub(r'\\_', text[last:].translate(_LATEX_ESCAPE_TABLE)))
+        return "".join(out)
+
+    def _scan_images(self):
+        """Map image-directory file names to their extension, listed once per document."""
+        try:
+            with os.scandir(IMG_DIR) as it:
+                return {e.name: e.name.rsplit(".", 1)[-1].lower() for e in it if e.is_file()}
+        except FileNotFoundError:
+            return {}
+
+    def _image_ext(self, path, avail_map):
+        """Extension of an existing image file, or None if it is absent."""
+        if os.path.dirname(path) == IMG_DIR:
+            return avail_map.get(os.path.basename(path))
+        if os.path.exists(path):
+            return path.rsplit(".", 1)[-1].lower()
+        return None
 
     def _generate_titlepage(self):
         return r"""
@@ -288,6 +318,7 @@ class FeynmanLatexGen:
             tex.append(f"\\epigraph{{\\itshape ``{epigraph_text}''}}{{--- \\textup{{Richard P. Feynman}}}}")
             tex.append("\\vspace{8pt}")
 
+        avail_map = self._scan_images()
         is_first_para = True
         for section in data.get("sections", []):
             sec_title = self._clean_title(section.get("title_ko") or section.get("title"))
@@ -328,27 +359,30 @@ class FeynmanLatexGen:
                 
                 elif item["type"] == "figure":
                     src = item.get("src")
+                    img_name = os.path.basename(src)
                     # Image path logic - check images subfolder
                     if not src.startswith("images/"):
-                        img_path = os.path.join("feynman_json", "images", os.path.basename(src))
+                        img_path = f"{IMG_DIR}/{img_name}"
                     else:
-                        img_path = os.path.join("feynman_json", src)
+                        img_path = f"{IMG_ROOT}/{src}"
                         
-                    pdf_path = img_path.replace(".svgz", ".pdf").replace(".svg", ".pdf")
+                    pdf_path = _EXT_RE.sub(".pdf", img_path)
                     
                     caption = self._clean_title(item.get("caption_ko") or item.get("caption"))
                     tex.append("\\begin{center}")
                     tex.append(f"\\begin{{diagrambox}}{{{caption}}}")
                     
-                    if os.path.exists(pdf_path):
+                    if self._image_ext(pdf_path, avail_map) is not None:
                         tex.append(f"\\includegraphics[width=0.8\\textwidth]{{{pdf_path}}}")
-                    elif os.path.exists(img_path) and not img_path.endswith((".pdf", ".jpg", ".png")):
-                         tex.append(f"\\fbox{{Missing vector conversion: {self._escape_latex(os.path.basename(src))}}}")
-                    elif os.path.exists(img_path):
-                        tex.append(f"\\includegraphics[width=0.8\\textwidth]{{{img_path}}}")
                     else:
-                        tex.append(f"\\fbox{{Missing Figure: {self._escape_latex(os.path.basename(src))}}}")
-                        
+                        ext = self._image_ext(img_path, avail_map)
+                        if ext is None:
+                            tex.append(f"\\fbox{{Missing Figure: {self._escape_latex(img_name)}}}")
+                        elif ext in _RASTER_EXTS:
+                            tex.append(f"\\includegraphics[width=0.8\\textwidth]{{{img_path}}}")
+                        else:
+                            tex.append(f"\\fbox{{Missing vector conversion: {self._escape_latex(img_name)}}}")
+
                     tex.append("\\end{diagrambox}")
                     tex.append("\\end{center}")
                 
@@ -12,6 +12,7 @@ class FeynmanParser:
         self.raw_dir = raw_dir
         self.output_dir = output_dir
         self.img_dir = os.path.join(output_dir, "images")
+        self._base_url = "https://www.feynmanlectures.caltech.edu/"
         
         for d in [self.output_dir, self.img_dir]:
             if not os.path.exists(d):
@@ -157,8 +158,13 @@ class FeynmanParser:
                 return
 
             # Handle relative paths for downloading
-            base_img_url = "https://www.feynmanlectures.caltech.edu/"
-            full_img_url = urljoin(base_img_url, src)
+            if src.startswith(("http://", "https://")):
+                full_img_url = src
+            elif src.startswith("//") or "./" in src or ":" in src:
+                # Oddly-formed paths still go through urljoin for correctness
+                full_img_url = urljoin(self._base_url, src)
+            else:
+                full_img_url = self._base_url + src.lstrip("/")
             
             # Local filename
             img_filename = os.path.basename(src)
@@ -54,6 +54,8 @@ class FeynmanTranslator:
     def __init__(self, model_name: str = "qwen2.5-coder:7b", base_url: str = "http://localhost:11434"):
         self.model_name = model_name
         self.base_url = f"{base_url}/api/chat"
+        # Keep-alive connection reused for every paragraph
+        self.session = requests.Session()
         self.glossary = PHYSICS_GLOSSARY
 
     def _build_hint(self, text: str) -> str:
@@ -103,7 +105,7 @@ class FeynmanTranslator:
         }
 
         try:
-            r = requests.post(self.base_url, json=payload, timeout=300)
+            r = self.session.post(self.base_url, json=payload, timeout=300)
             r.raise_for_status()
             result = r.json()["message"]["content"].strip()
 
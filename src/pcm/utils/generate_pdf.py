@@ -3,7 +3,6 @@
 Generate PDF from translated JSON files
 """
 
-import json
 from pathlib import Path
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -15,6 +14,12 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from tqdm import tqdm
 import os
+import sys
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from pcm.core import jsonio
 
 
 class PDFGenerator:
@@ -161,9 +166,8 @@ class PDFGenerator:
         # Process each section
         for json_file in tqdm(json_files, desc="Generating PDF", unit="section"):
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    section_data = json.load(f)
-                    self.add_section(section_data)
+                section_data = jsonio.load_section(json_file)
+                self.add_section(section_data)
             except Exception as e:
                 print(f"Error processing {json_file}: {e}")
         
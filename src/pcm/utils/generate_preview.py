@@ -1,4 +1,6 @@
 import sys
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 # Add src to sys.path
 sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
@@ -50,6 +52,12 @@ def build_pdf(output_dir, part_label):
         else:
             print(f"Failed to generate PDF for {output_dir}")
 
+def build_all(parts):
+    """Build several (output_dir, part_label) parts concurrently.
+    Each part compiles in its own latex dir, so the XeLaTeX runs don't interact.
+    """
+    with ThreadPoolExecutor(max_workers=len(parts)) as ex:
+        list(ex.map(lambda part: build_pdf(*part), parts))
+
 if __name__ == "__main__":
-    build_pdf("output_part_02", "II")
-    build_pdf("output_part_03", "III")
+    build_all([("output_part_02", "II"), ("output_part_03", "III")])
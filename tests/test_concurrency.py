@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Test staged_map and bounded_map: stage ordering, concurrency caps and lazy input."""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from pcm.core.concurrency import bounded_map, staged_map
+
+N_ITEMS = 60
+
+
+class Tracker:
+    """Counts calls in flight per stage and how far the input was pulled."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = {}
+        self.peak = {}
+        self.pulled = 0
+        self.first_done = 0
+        self.max_ahead = 0
+
+    def items(self, n):
+        for i in range(n):
+            with self.lock:
+                self.pulled += 1
+                # Items taken from the input but not yet through stage one
+                self.max_ahead = max(self.max_ahead, self.pulled - self.first_done)
+            yield {"id": i, "done": []}
+
+    def stage(self, name, is_first=False):
+        def fn(item):
+            # The caller records each result before the next stage runs
+            done = list(item["done"])
+            with self.lock:
+                self.running[name] = self.running.get(name, 0) + 1
+                self.peak[name] = max(self.peak.get(name, 0), self.running[name])
+            time.sleep(random.random() * 0.005)
+            with self.lock:
+                self.running[name] -= 1
+                if is_first:
+                    self.first_done += 1
+            return done
+        return fn
+
+
+def check_staged_map(k=(3, 2, 1)):
+    tracker = Tracker()
+    stages = [("a", tracker.stage("a", is_first=True), k[0]),
+              ("b", tracker.stage("b"), k[1]),
+              ("c", tracker.stage("c"), k[2])]
+    seen = {}
+    for name, item, result in staged_map(tracker.items(N_ITEMS), stages):
+        # Stages run in order, each seeing what the caller stored before it
+        expected = [s for s, _, _ in stages][:len(item["done"])]
+        assert item["done"] == expected == result, (name, item, result)
+        item["done"].append(name)
+        seen.setdefault(item["id"], []).append(name)
+
+    assert sorted(seen) == list(range(N_ITEMS)), "every item yielded"
+    assert all(v == ["a", "b", "c"] for v in seen.values()), "each stage once, in order"
+    for name, _, cap in stages:
+        assert tracker.peak[name] <= cap, f"stage {name} ran {tracker.peak[name]} > {cap}"
+    # Only stage one pulls input, at most its window ahead of its results
+    assert tracker.max_ahead <= k[0], f"pulled {tracker.max_ahead} items ahead"
+    print(f"  staged_map: peaks {tracker.peak}, max pulled ahead {tracker.max_ahead}")
+
+
+def check_staged_map_early_exit():
+    tracker = Tracker()
+    stages = [("a", tracker.stage("a", is_first=True), 2), ("b", tracker.stage("b"), 2)]
+    gen = staged_map(tracker.items(N_ITEMS), stages)
+    next(gen)
+    gen.close()
+    # Closing the generator stops pulling input and joins the pools
+    assert tracker.pulled <= 3, f"pulled {tracker.pulled} items after close"
+    assert not any(tracker.running.values()), "workers still running after close"
+    print(f"  staged_map early exit: pulled {tracker.pulled} of {N_ITEMS}")
+
+
+def check_bounded_map(k=4):
+    tracker = Tracker()
+    fn = tracker.stage("map", is_first=True)
+    done = sorted(item["id"] for item, _ in bounded_map(fn, tracker.items(N_ITEMS), k))
+    assert done == list(range(N_ITEMS)), "every item yielded once"
+    assert tracker.peak["map"] <= k, f"{tracker.peak['map']} calls ran at once > {k}"
+    assert tracker.max_ahead <= k, f"pulled {tracker.max_ahead} items ahead"
+    print(f"  bounded_map: peak {tracker.peak['map']}, max pulled ahead {tracker.max_ahead}")
+
+
+def main():
+    print("=" * 60)
+    print("Concurrency Helpers Test")
+    print("=" * 60)
+
+    random.seed(0)
+    for _ in range(5):
+        check_staged_map()
+    check_staged_map((1, 4, 2))
+    check_staged_map_early_exit()
+    check_bounded_map()
+    check_bounded_map(1)
+
+    print("\nAll concurrency checks passed.")
+
+
+if __name__ == "__main__":
+    main()
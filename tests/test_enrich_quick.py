@@ -2,7 +2,6 @@
 """Quick test: run enrichment only on 2 sections, then build PDF with enrichment boxes."""
 
 import sys
-import json
 import subprocess
 import shutil
 from pathlib import Path
@@ -10,7 +9,9 @@ from pathlib import Path
 # Add src to sys.path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
+from pcm.core import jsonio
 from pcm.core.verifier import TranslationVerifier
+from pcm.core.json_to_latex import list_section_files
 
 SECTIONS_DIR = Path("output_test/sections")
 LATEX_DIR = Path("output_test/latex_clean")
@@ -31,17 +32,16 @@ def main():
         return
 
     # Load only first 2 sections for quick test
-    json_files = sorted(SECTIONS_DIR.glob("*.json"))[:2]
+    json_files = list_section_files(SECTIONS_DIR)[:2]
     sections = []
     for jf in json_files:
-        with open(jf, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            sections.append(data)
+        data = jsonio.load_section(jf)
+        sections.append((jf, data))
         print(f"Loaded: {jf.name} - {data.get('title_original', '')[:50]}")
 
     # Run enrichment only (skip verification - use existing scores)
     print(f"\nRunning enrichment on {len(sections)} sections...\n")
-    for section_data in sections:
+    for _, section_data in sections:
         sid = section_data.get("section_id", "?")
         if not section_data.get("content_original"):
             continue
@@ -57,17 +57,11 @@ def main():
             print(f"    No enrichments generated")
         print()
 
-    # Save updated JSON
+    # Save updated JSON back to the file each section was loaded from
     print("Saving enriched JSON...")
-    for section_data in sections:
-        sid = section_data.get("section_id", "")
-        for candidate in [SECTIONS_DIR / f"{sid}.json",
-                          SECTIONS_DIR / f"{sid.replace('.', '_')}.json"]:
-            if candidate.exists():
-                with open(candidate, "w", encoding="utf-8") as f:
-                    json.dump(section_data, f, ensure_ascii=False, indent=2)
-                print(f"  Saved {candidate.name}")
-                break
+    for jf, section_data in sections:
+        jsonio.dump_section(section_data, jf)
+        print(f"  Saved {jf.name}")
 
     # Build PDF with all sections (including enrichments from updated JSON)
     print("\nBuilding PDF...")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Test the verifier's formula tokenizer and its HTML sup/sub and broken-command
+auto-fixes against the versions they replaced, on fixed cases and random text.
+No Ollama server is needed."""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from pcm.core.verifier import TranslationVerifier
+
+MATH_FRAGMENTS = ["$", "$$", "\\(", "\\)", "\\[", "\\]", "\\frac{a}{b}", "\\int", "\\in",
+                  "\\infty", "\\mathbb{R}", "\\text{ok}", "x_1", "y^{2}", "a", "Z", " ",
+                  "\n", "정리", "{", "}", "_", "^"]
+# Well-formed, unnested tags; plain words avoid the auto-fix 3 command names
+HTML_FRAGMENTS = ["<sup>2</sup>", "<sup>k+1</sup>", "<sub>i</sub>", "<sub></sub>",
+                  "<sup>a b</sup>", "ab", " ", "12", "가", "$x$"]
+# Command names, their prefixes and overlaps, with and without a backslash
+CMD_FRAGMENTS = ["frac", "sum", "int", "infty", "in", "sin", "cos", "co", "s", "log",
+                 "ln", "exp", "sqrt", "\\", " ", "{", "(", "x", "\n"]
+
+
+def _old_extract_math_tokens(v: TranslationVerifier, text: str):
+    """Previous implementation: math regions were scanned twice."""
+    tokens = []
+    for pattern in v._MATH_RES:
+        for match in pattern.finditer(text):
+            tokens.append(match.group(0))
+    tokens.extend(m.group(0) for m in v._LATEX_RE.finditer(text))
+    math_regions = []
+    for pattern in v._MATH_RES:
+        math_regions.extend(pattern.findall(text))
+    for region in math_regions:
+        for match in v._VAR_RE.finditer(region):
+            tokens.append(match.group(0))
+    return tokens
+
+
+def _old_fix_html(text: str):
+    """Previous auto-fix 1: one str.replace over the text per tag found."""
+    fixed = []
+    html_sup = TranslationVerifier._HTML_SUP_RE.findall(text)
+    for s in html_sup:
+        text = text.replace(f'<sup>{s}</sup>', f'^{{{s}}}')
+    if html_sup:
+        fixed.append(f"Converted {len(html_sup)} HTML superscripts to LaTeX")
+    html_sub = TranslationVerifier._HTML_SUB_RE.findall(text)
+    for s in html_sub:
+        text = text.replace(f'<sub>{s}</sub>', f'_{{{s}}}')
+    if html_sub:
+        fixed.append(f"Converted {len(html_sub)} HTML subscripts to LaTeX")
+    return text, fixed
+
+
+def _old_restore_commands(text: str):
+    """Previous auto-fix 3 substitution: one pass per broken command."""
+    restored = []
+    for cmd in TranslationVerifier.BROKEN_COMMANDS:
+        broken_re = re.compile(rf'(?<!\\)({cmd})(?=[\s{{(])')
+        if broken_re.search(text):
+            text = broken_re.sub(rf'\\{cmd}', text)
+            restored.append(cmd)
+    return text, restored
+
+
+def check_fixed_tokens(v):
+    cases = {
+        "$x_1 + y$": ["$x_1 + y$", "x_1", "y"],
+        # A command is one token; \int and \infty do not also yield \in / \inf
+        "\\int_0^\\infty f \\in S": ["\\int", "\\infty", "\\in"],
+        "\\(\\frac{a}{b}\\)": ["\\(\\frac{a}{b}\\)", "\\frac{a}{b}", "a", "b"],
+        "plain text": [],
+    }
+    for text, expected in cases.items():
+        got = v._extract_math_tokens(text)
+        assert got == expected, (text, got, expected)
+    print(f"  fixed token cases: {len(cases)} OK")
+
+
+def check_random_tokens(v, trials=20000):
+    rng = random.Random(0)
+    for _ in range(trials):
+        text = "".join(rng.choice(MATH_FRAGMENTS) for _ in range(rng.randint(0, 14)))
+        assert v._extract_math_tokens(text) == _old_extract_math_tokens(v, text), repr(text)
+    print(f"  random texts: {trials} token lists match the previous implementation")
+
+
+def check_random_html(v, trials=30000):
+    rng = random.Random(1)
+    for _ in range(trials):
+        # The original holds only $x$, which the translation keeps, so
+        # auto-fix 1 is the only rule that changes the text
+        text = "$x$" + "".join(rng.choice(HTML_FRAGMENTS) for _ in range(rng.randint(0, 10)))
+        result, fixed_text = v._check_formula_integrity("$x$", text)
+        expected_text, expected_fixed = _old_fix_html(text)
+        assert fixed_text == expected_text, (text, fixed_text, expected_text)
+        assert result.auto_fixed == expected_fixed, (text, result.auto_fixed)
+    print(f"  random texts: {trials} sup/sub fixes match the previous implementation")
+
+
+def check_random_commands(v, trials=30000):
+    rng = random.Random(2)
+    for _ in range(trials):
+        text = "".join(rng.choice(CMD_FRAGMENTS) for _ in range(rng.randint(0, 12)))
+        restored = set()
+
+        def restore(match):
+            restored.add(match.group(1))
+            return "\\" + match.group(1)
+
+        fixed = v._BROKEN_CMD_RE.sub(restore, text)
+        order = [cmd for cmd in v.BROKEN_COMMANDS if cmd in restored]
+        assert (fixed, order) == _old_restore_commands(text), repr(text)
+    print(f"  random texts: {trials} command restores match the per-command passes")
+
+
+def main():
+    print("=" * 60)
+    print("Formula Check Test")
+    print("=" * 60)
+
+    verifier = TranslationVerifier()
+    check_fixed_tokens(verifier)
+    check_random_tokens(verifier)
+    check_random_html(verifier)
+    check_random_commands(verifier)
+
+    print("\nAll formula checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Test json_to_latex._safe_escape against the multi-pass implementation it
+replaced, on fixed cases and random text built from LaTeX-like fragments."""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from pcm.core.json_to_latex import _safe_escape
+
+FRAGMENTS = ["\\", "\\\\", "\\textbf{", "\\paragraph{", "\\item", "\\items", "\\x",
+             "{", "}", "&", "%", "#", "_", "^", "a", "b1", " ", "\n", "정리", "$"]
+
+
+def _old_safe_escape(text: str) -> str:
+    """Previous implementation: protect commands, escape, then restore."""
+    protected = {}
+    counter = [0]
+
+    def protect(match):
+        key = f"@@PROT{counter[0]}@@"
+        protected[key] = match.group(0)
+        counter[0] += 1
+        return key
+
+    text = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', protect, text)
+    text = re.sub(r'\\\\', protect, text)
+    text = re.sub(r'\\item\b', protect, text)
+    text = re.sub(r'\\paragraph\{[^}]*\}', protect, text)
+
+    text = text.replace('&', '\\&')
+    text = text.replace('%', '\\%')
+    text = text.replace('#', '\\#')
+    text = text.replace('_', '\\_')
+    text = text.replace('^', '\\^{}')
+
+    for key, val in protected.items():
+        text = text.replace(key, val)
+    return text
+
+
+def check_fixed_cases():
+    cases = {
+        "a_1 & b": "a\\_1 \\& b",
+        "100% #1 x^2": "100\\% \\#1 x\\^{}2",
+        "\\textbf{a_b} c_d": "\\textbf{a_b} c\\_d",
+        "line\\\\\\item next_": "line\\\\\\item next\\_",
+        "\\\\textbf{x_y}": "\\\\textbf{x_y}",
+        "\\paragraph{A & B} & C": "\\paragraph{A & B} \\& C",
+    }
+    for text, expected in cases.items():
+        got = _safe_escape(text)
+        assert got == expected, (text, got, expected)
+        assert got == _old_safe_escape(text), text
+    print(f"  fixed cases: {len(cases)} OK")
+
+
+def check_random_equivalence(trials=50000):
+    rng = random.Random(0)
+    for _ in range(trials):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+        assert _safe_escape(text) == _old_safe_escape(text), repr(text)
+    print(f"  random texts: {trials} match the previous implementation")
+
+
+def main():
+    print("=" * 60)
+    print("LaTeX Escape Test")
+    print("=" * 60)
+
+    check_fixed_cases()
+    check_random_equivalence()
+
+    print("\nAll escape checks passed.")
+
+
+if __name__ == "__main__":
+    main()
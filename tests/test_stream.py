@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Test TranslationVerifier._stream_ollama on canned streams: <think> tags split
+across chunk boundaries are hidden from the stop predicate, and a satisfied
+predicate closes the stream early. No Ollama server is needed."""
+
+import json
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from pcm.core.verifier import TranslationVerifier
+
+THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+WORDS = ["a", "bc", " ", "\n", "<", ">", "think", "/", "x y", "</", "<th"]
+
+
+class FakeResponse:
+    """A streamed /api/generate response that yields one chunk per line."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.read = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        for piece in self.pieces:
+            self.read += 1
+            yield json.dumps({"response": piece, "done": False}).encode("utf-8")
+        self.read += 1
+        yield json.dumps({"response": "", "done": True}).encode("utf-8")
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def post(self, url, **kwargs):
+        assert kwargs.get("stream"), "streamed request expected"
+        return self.response
+
+
+def stream(verifier, pieces, stop):
+    """Run _stream_ollama over pieces; returns (text, stop calls, response)."""
+    response = FakeResponse(pieces)
+    verifier.session = FakeSession(response)
+    seen = []
+
+    def record(text):
+        seen.append(text)
+        return stop(text)
+
+    text = verifier._stream_ollama({"model": "m", "prompt": "p"}, record)
+    return text, seen, response
+
+
+def random_text(rng):
+    """Visible words with complete think blocks whose bodies look like tags."""
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        if rng.random() < 0.3:
+            body = "".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+            parts.append("<think>" + body.replace("</think>", "") + "</think>")
+        else:
+            parts.append(rng.choice(WORDS))
+    return "".join(parts) + "end"
+
+
+def random_split(rng, text):
+    cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(0, 12))))
+    bounds = [0] + cuts + [len(text)]
+    return [text[i:j] for i, j in zip(bounds, bounds[1:])]
+
+
+def check_split_tags(verifier, trials=3000):
+    rng = random.Random(0)
+    for _ in range(trials):
+        text = random_text(rng)
+        pieces = random_split(rng, text)
+        visible = THINK_RE.sub("", text)
+        raw, seen, _ = stream(verifier, pieces, lambda t: False)
+        assert raw == text, (pieces, raw)
+        assert seen and seen[-1] == visible, (pieces, seen, visible)
+        for shown in seen:
+            assert visible.startswith(shown), (pieces, shown, visible)
+    print(f"  split think tags: {trials} random streams OK")
+
+
+def check_fixed_cases(verifier):
+    cases = [
+        (["<thi", "nk>secret</th", "ink>answer"], "answer"),
+        (["<", "think>", "s", "<", "/think>", "ok"], "ok"),
+        (["a<", "b"], "a<b"),
+        (["a</think>b"], "a</think>b"),
+        # Nothing is checked while a think block is still open
+        (["x<think>never closed"], ""),
+    ]
+    for pieces, visible in cases:
+        _, seen, _ = stream(verifier, pieces, lambda t: False)
+        assert (seen[-1] if seen else "") == visible, (pieces, seen)
+        assert not any("secret" in s or "never" in s for s in seen), (pieces, seen)
+    print(f"  fixed cases: {len(cases)} OK")
+
+
+def check_early_stop(verifier):
+    pieces = ["<think>STOP", " is only a thought</think>", "one ", "ST", "OP", " two", " three"]
+    raw, seen, response = stream(verifier, pieces, lambda t: "STOP" in t)
+    assert seen[-1] == "one STOP", seen
+    assert raw == "".join(pieces[:5]), raw
+    assert response.read == 5 and response.closed, (response.read, response.closed)
+    print("  early stop: closed after the satisfying chunk")
+
+
+def main():
+    print("=" * 60)
+    print("Streamed Generation Test")
+    print("=" * 60)
+
+    verifier = TranslationVerifier()
+    check_fixed_cases(verifier)
+    check_split_tags(verifier)
+    check_early_stop(verifier)
+
+    print("\nAll stream checks passed.")
+
+
+if __name__ == "__main__":
+    main()
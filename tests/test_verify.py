@@ -5,7 +5,6 @@ Uses output_test/sections/ as input (already translated data).
 """
 
 import sys
-import json
 import subprocess
 import shutil
 from pathlib import Path
@@ -13,8 +12,9 @@ from pathlib import Path
 # Add src to sys.path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
+from pcm.core import jsonio
 from pcm.core.verifier import TranslationVerifier
-from pcm.core.json_to_latex import generate_full_document
+from pcm.core.json_to_latex import generate_full_document, list_section_files, load_json_files
 
 OUTPUT_DIR = Path("output_test")
 SECTIONS_DIR = OUTPUT_DIR / "sections"
@@ -37,31 +37,32 @@ def main():
         return
 
     # ─── Step 2: Load sections ───
-    json_files = sorted(SECTIONS_DIR.glob("*.json"))
+    json_files = list_section_files(SECTIONS_DIR)
     print(f"\nFound {len(json_files)} sections to verify")
 
     sections = {}
-    for jf in json_files:
-        with open(jf, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            sid = data.get("section_id", jf.stem)
-            sections[sid] = data
+    for jf, data in zip(json_files, load_json_files(json_files)):
+        sid = data.get("section_id", jf.stem)
+        sections[sid] = data
 
     # ─── Step 3: Run verification ───
     print(f"\nRunning verification with {VERIFY_MODEL}...\n")
     scores = []
 
+    pending = {}
     for sid, section_data in sections.items():
         if not section_data.get("content_translated"):
             print(f"  {sid}: no translation, skipping")
             continue
+        pending[sid] = section_data
 
-        print(f"  Section {sid}:")
-        report = verifier.verify_section(section_data)
-        section_data["verification"] = report
+    # Sections are independent, so they are verified concurrently
+    for sid, report in verifier.verify_sections(pending):
+        sections[sid]["verification"] = report
 
         score = report.get("score", 0)
-        scores.append(score)
+        scores.append((sid, score))
+        print(f"  Section {sid}:")
         print(f"    Score: {score} "
               f"(F:{report.get('formula',{}).get('score','-')} "
               f"S:{report.get('semantic',{}).get('score','-')} "
@@ -69,21 +70,19 @@ def main():
               f"R:{report.get('research',{}).get('score','-')})")
 
     if scores:
-        avg = sum(scores) / len(scores)
+        avg = sum(s for _, s in scores) / len(scores)
         print(f"\n  Average score: {avg:.1f}")
-        low = [(sid, s) for sid, s in zip(sections.keys(), scores) if s < 60]
+        low = [(sid, s) for sid, s in scores if s < 60]
         if low:
             print(f"  Low-score sections: {low}")
 
     # ─── Step 3.5: Enrich with educational content ───
     print(f"\nEnriching sections with deep research content...\n")
-    for sid, section_data in sections.items():
-        if not section_data.get("content_original"):
-            continue
+    to_enrich = {sid: s for sid, s in sections.items() if s.get("content_original")}
+    for sid, enrichments in verifier.enrich_sections(to_enrich):
         print(f"  Enriching {sid}:")
-        enrichments = verifier.enrich_section(section_data)
         if enrichments:
-            section_data["enrichments"] = enrichments
+            sections[sid]["enrichments"] = enrichments
             print(f"    → {len(enrichments)} concepts researched")
             for e in enrichments:
                 print(f"      - {e['title_ko']}")
@@ -104,8 +103,7 @@ def main():
                 out_file = c
                 break
 
-        with open(out_file, "w", encoding="utf-8") as f:
-            json.dump(section_data, f, ensure_ascii=False, indent=2)
+        jsonio.dump_section(section_data, out_file)
 
     # ─── Step 5: Generate LaTeX ───
     print("\nGenerating LaTeX...")
@@ -122,13 +120,26 @@ def main():
         for run in range(2):
             label = "1st pass" if run == 0 else "2nd pass (TOC)"
             print(f"  XeLaTeX {label}...")
+            # The 1st pass only has to write .aux/.toc; -no-pdf stops at the
+            # .xdv and skips the xdvipdfmx stage (font subsetting, images)
+            draft = ["-no-pdf"] if run == 0 else []
+            # stdout only repeats main.log, so it is discarded rather than buffered
             result = subprocess.run(
-                ["xelatex", "-interaction=nonstopmode", "main.tex"],
+                ["xelatex", "-interaction=nonstopmode", "-file-line-error", *draft, "main.tex"],
                 cwd=str(LATEX_DIR),
-                capture_output=True, text=True, timeout=120,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120,
             )
             if result.returncode != 0:
                 print(f"  XeLaTeX warning/error (may still produce PDF)")
+                log_file = LATEX_DIR / "main.log"
+                if log_file.exists():
+                    log = log_file.read_text(encoding="utf-8", errors="replace")
+                    # -file-line-error marks errors as ./main.tex:<line>: ...
+                    errors = [l for l in log.splitlines() if l.startswith("./")]
+                    for line in errors[:5]:
+                        print(f"    {line}")
+                for line in result.stderr.decode(errors="replace").splitlines()[-5:]:
+                    print(f"    {line}")
 
         pdf_file = LATEX_DIR / "main.pdf"
         if pdf_file.exists():
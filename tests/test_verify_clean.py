@@ -4,12 +4,13 @@ Clean test: generate LaTeX with verification boxes only (no supplements).
 Strips problematic content to ensure clean PDF compilation.
 """
 
+import io
 import sys
-import json
-import re
 import subprocess
 import shutil
+from functools import lru_cache
 from pathlib import Path
+from typing import TextIO
 
 # Add src to sys.path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
@@ -17,6 +18,12 @@ sys.path.append(str(Path(__file__).parent.parent / "src"))
 SECTIONS_DIR = Path("output_test/sections")
 LATEX_DIR = Path("output_test/latex_clean")
 
+# LaTeX-breaking chars dropped from titles, removed in one translate pass
+_STRIP_TABLE = str.maketrans("", "", "\\{}$&%#_^~")
+# Verification modules shown in the box, in display order
+_MOD_PAIRS = (("formula", "수식"), ("semantic", "의미"),
+              ("logic", "논리"), ("research", "검증"))
+
 
 def clean_title(title: str) -> str:
     """Ensure title is a single line with no LaTeX-breaking chars."""
@@ -25,83 +32,85 @@ def clean_title(title: str) -> str:
     # Take only first line
     title = title.split('\n')[0].strip()
     # Remove LaTeX special chars from title
-    for ch in ['\\', '{', '}', '$', '&', '%', '#', '_', '^', '~']:
-        title = title.replace(ch, '')
+    title = title.translate(_STRIP_TABLE)
     return title[:80] if title else "제목 없음"
 
 
-def render_verification(verification: dict) -> str:
-    """Render verification box."""
+def render_verification(verification: dict, out: TextIO) -> None:
+    """Render verification box into out."""
     if not verification or verification.get("skipped"):
-        return ""
+        return
     score = verification.get("score", 0)
     label = "우수" if score >= 90 else "양호" if score >= 70 else "주의" if score >= 50 else "경고"
     modules = []
-    for mod_name, mod_label in [("formula", "수식"), ("semantic", "의미"),
-                                 ("logic", "논리"), ("research", "검증")]:
+    for mod_name, mod_label in _MOD_PAIRS:
         mod = verification.get(mod_name, {})
         if not mod.get("skipped"):
             ms = mod.get("score", "-")
             ic = len(mod.get("issues", [])) + len(mod.get("flagged", []))
             modules.append(f"{mod_label} {ms}" + (f" ({ic}건)" if ic else ""))
     modules_str = " \\quad ".join(modules)
-    return f"""
+    out.write(f"""
 \\begin{{verificationbox}}
 \\textbf{{종합 점수: {score}/100 ({label})}} \\\\[2pt]
 {{\\small {modules_str}}}
 \\end{{verificationbox}}
 \\vspace{{6pt}}
-"""
+""")
 
 
-def render_enrichments(enrichments: list) -> str:
-    """Render deep research enrichment entries as educational content boxes."""
-    if not enrichments:
-        return ""
+@lru_cache(maxsize=4096)
+def _clean_cached(text: str) -> str:
+    """clean_for_latex memoized for short enrichment strings, which repeat
+    across sections (titles, Wikipedia sources)."""
     from pcm.core.json_to_latex import clean_for_latex
-    parts = []
-    parts.append("\n\\vspace{8pt}\n{\\large\\textbf{\\textsf{심층 해설 (Deep Research)}}}\n\\vspace{4pt}\n")
+    return clean_for_latex(text)
+
+
+def render_enrichments(enrichments: list, out: TextIO) -> None:
+    """Render deep research enrichment entries as educational content boxes into out."""
+    if not enrichments:
+        return
+    out.write("\n\\vspace{8pt}\n{\\large\\textbf{\\textsf{심층 해설 (Deep Research)}}}\n\\vspace{4pt}\n")
     for entry in enrichments:
-        title_ko = clean_for_latex(entry.get("title_ko", entry.get("term", "")))
-        explanation = clean_for_latex(entry.get("explanation", ""))
+        title_ko = _clean_cached(entry.get("title_ko", entry.get("term", "")))
+        explanation = _clean_cached(entry.get("explanation", ""))
         source = entry.get("source", "")
         if not explanation:
             continue
         source_line = ""
         if source:
-            source_escaped = clean_for_latex(source)
+            source_escaped = _clean_cached(source)
             source_line = f"\n\\vspace{{2pt}}\n{{\\scriptsize \\textit{{출처: Wikipedia --- {source_escaped}}}}}"
-        parts.append(f"""
+        out.write("\n")
+        out.write(f"""
 \\begin{{researchbox}}[{title_ko}]
 {explanation}{source_line}
 \\end{{researchbox}}
 \\vspace{{4pt}}
 """)
-    return "\n".join(parts)
 
 
 def main():
     LATEX_DIR.mkdir(parents=True, exist_ok=True)
 
     # Load sections
-    json_files = sorted(SECTIONS_DIR.glob("*.json"))
-    sections = []
-    for jf in json_files:
-        with open(jf, "r", encoding="utf-8") as f:
-            sections.append(json.load(f))
+    from pcm.core.json_to_latex import list_section_files, load_json_files, section_sort_key
+    json_files = list_section_files(SECTIONS_DIR)
+    sections = load_json_files(json_files)
 
-    sections.sort(key=lambda s: [int(x) if x.isdigit() else x
-                                  for x in re.split(r'[._]', s.get('section_id', '0'))])
+    sections.sort(key=section_sort_key)
 
     print(f"Loaded {len(sections)} sections")
 
     # Build LaTeX
     from pcm.core.json_to_latex import generate_preamble, clean_for_latex
 
-    preamble = generate_preamble()
-    body = []
-    body.append(r"\begin{document}")
-    body.append(r"""
+    # Assembled in one buffer rather than a list of parts joined at the end
+    buf = io.StringIO()
+    buf.write(generate_preamble())
+    buf.write("\\begin{document}\n")
+    buf.write(r"""
 \begin{titlepage}
 \centering
 \vspace*{3cm}
@@ -114,9 +123,9 @@ def main():
 {\small 번역: AI 보조 번역 시스템\par}
 \end{titlepage}
 """)
-    body.append(r"\tableofcontents")
-    body.append(r"\newpage")
-    body.append(r"\part{제 I 부: 소개}")
+    buf.write("\n\\tableofcontents\n")
+    buf.write("\\newpage\n")
+    buf.write("\\part{제 I 부: 소개}\n")
 
     for section in sections:
         sid = section.get("section_id", "")
@@ -137,30 +146,24 @@ def main():
         # Clean body (simplified - just escape the worst offenders)
         body_text = clean_for_latex(content) if content else ""
 
-        # Verification box
-        verify_tex = render_verification(verification)
-
-        # Enrichment boxes
-        enrich_tex = render_enrichments(enrichments)
-
-        body.append(f"""
+        buf.write(f"""
 % ═══ Section {sid} ═══
 {heading}
 \\label{{sec:{sid.replace('.', '-')}}}
 
 {body_text}
 
-{enrich_tex}
-{verify_tex}
 """)
+        # Enrichment and verification boxes render straight into the buffer
+        render_enrichments(enrichments, buf)
+        buf.write("\n")
+        render_verification(verification, buf)
+        buf.write("\n\n")
 
-    body.append(r"\end{document}")
-
-    full_doc = preamble + "\n".join(body)
+    buf.write("\\end{document}")
 
     tex_file = LATEX_DIR / "main.tex"
-    with open(tex_file, "w", encoding="utf-8") as f:
-        f.write(full_doc)
+    tex_file.write_text(buf.getvalue(), encoding="utf-8")
     print(f"LaTeX written to {tex_file}")
 
     # Compile